@@ -0,0 +1,58 @@
+"""Add trigram search indexes to medicines
+
+Revision ID: 3c7e1d9b4f05
+Revises: 4f8a2c6e1d57
+Create Date: 2026-10-15 10:48:03.217640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e1d9b4f05'
+down_revision: Union[str, Sequence[str], None] = '4f8a2c6e1d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# GIN trigram indexes serve the '%q%' ILIKE search; the text_pattern_ops
+# btree serves the prefix match used for one- and two-character queries
+POSTGRESQL_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_medicines_name_trgm "
+    "ON medicines USING gin (name gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_medicines_generic_name_trgm "
+    "ON medicines USING gin (generic_name gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_medicines_name_lower_pattern "
+    "ON medicines (lower(name) text_pattern_ops)",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_medicines_name_lower_pattern",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_medicines_generic_name_trgm",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_medicines_name_trgm",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for statement in POSTGRESQL_UPGRADE:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for statement in POSTGRESQL_DOWNGRADE:
+            op.execute(statement)
@@ -0,0 +1,30 @@
+"""Drop the cart_items cart_id index covered by the cart/medicine unique constraint
+
+Revision ID: 4f8a2c6e1d57
+Revises: 8d3f0a6c1e92
+Create Date: 2026-10-15 10:31:26.804113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8a2c6e1d57'
+down_revision: Union[str, Sequence[str], None] = '8d3f0a6c1e92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # _cart_medicine_uc (cart_id, medicine_id) already serves cart_id lookups
+    # and the cart/medicine pair lookup in add_to_cart
+    op.drop_index(op.f('ix_cart_items_cart_id'), table_name='cart_items')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_cart_items_cart_id'), 'cart_items', ['cart_id'], unique=False)
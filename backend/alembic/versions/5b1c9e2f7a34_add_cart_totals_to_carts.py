@@ -0,0 +1,176 @@
+"""Add denormalized cart totals maintained by triggers
+
+Revision ID: 5b1c9e2f7a34
+Revises: ad46644f4391
+Create Date: 2026-10-15 09:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1c9e2f7a34'
+down_revision: Union[str, Sequence[str], None] = 'ad46644f4391'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# PostgreSQL: one function recomputes a cart's totals, row triggers call it
+POSTGRESQL_UPGRADE = [
+    """
+    CREATE OR REPLACE FUNCTION refresh_cart_totals(p_cart_id VARCHAR) RETURNS void AS $$
+    BEGIN
+        UPDATE carts SET
+            subtotal = COALESCE(t.subtotal, 0),
+            item_count = t.item_count,
+            has_prescription_items = COALESCE(t.has_prescription_items, false)
+        FROM (
+            SELECT SUM(ci.quantity * m.price) AS subtotal,
+                   COUNT(ci.id) AS item_count,
+                   BOOL_OR(m.prescription_required) AS has_prescription_items
+            FROM cart_items ci
+            JOIN medicines m ON m.id = ci.medicine_id
+            WHERE ci.cart_id = p_cart_id
+        ) AS t
+        WHERE carts.id = p_cart_id;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION cart_items_refresh_cart_totals() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM refresh_cart_totals(NEW.cart_id);
+        ELSIF TG_OP = 'DELETE' THEN
+            PERFORM refresh_cart_totals(OLD.cart_id);
+        ELSE
+            PERFORM refresh_cart_totals(NEW.cart_id);
+            IF NEW.cart_id IS DISTINCT FROM OLD.cart_id THEN
+                PERFORM refresh_cart_totals(OLD.cart_id);
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER cart_items_cart_totals
+    AFTER INSERT OR UPDATE OR DELETE ON cart_items
+    FOR EACH ROW EXECUTE FUNCTION cart_items_refresh_cart_totals()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION medicines_refresh_cart_totals() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_cart_totals(c.cart_id)
+        FROM (SELECT DISTINCT cart_id FROM cart_items WHERE medicine_id = NEW.id) AS c;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER medicines_cart_totals
+    AFTER UPDATE OF price, prescription_required ON medicines
+    FOR EACH ROW
+    WHEN (OLD.price IS DISTINCT FROM NEW.price
+          OR OLD.prescription_required IS DISTINCT FROM NEW.prescription_required)
+    EXECUTE FUNCTION medicines_refresh_cart_totals()
+    """,
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS medicines_cart_totals ON medicines",
+    "DROP TRIGGER IF EXISTS cart_items_cart_totals ON cart_items",
+    "DROP FUNCTION IF EXISTS medicines_refresh_cart_totals()",
+    "DROP FUNCTION IF EXISTS cart_items_refresh_cart_totals()",
+    "DROP FUNCTION IF EXISTS refresh_cart_totals(VARCHAR)",
+]
+
+# Recompute totals for the carts matching {condition}; portable SQL used by
+# the SQLite triggers (no stored functions there) and the backfill
+REFRESH_CARTS = """
+    UPDATE carts SET
+        subtotal = (SELECT COALESCE(SUM(ci.quantity * m.price), 0)
+                    FROM cart_items ci JOIN medicines m ON m.id = ci.medicine_id
+                    WHERE ci.cart_id = carts.id),
+        item_count = (SELECT COUNT(*) FROM cart_items ci WHERE ci.cart_id = carts.id),
+        has_prescription_items = EXISTS (
+            SELECT 1 FROM cart_items ci JOIN medicines m ON m.id = ci.medicine_id
+            WHERE ci.cart_id = carts.id AND m.prescription_required
+        )
+    WHERE {condition}
+"""
+
+SQLITE_UPGRADE = [
+    f"""
+    CREATE TRIGGER cart_items_cart_totals_insert AFTER INSERT ON cart_items
+    BEGIN
+        {REFRESH_CARTS.format(condition="carts.id = NEW.cart_id")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER cart_items_cart_totals_update AFTER UPDATE ON cart_items
+    BEGIN
+        {REFRESH_CARTS.format(condition="carts.id IN (NEW.cart_id, OLD.cart_id)")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER cart_items_cart_totals_delete AFTER DELETE ON cart_items
+    BEGIN
+        {REFRESH_CARTS.format(condition="carts.id = OLD.cart_id")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER medicines_cart_totals AFTER UPDATE OF price, prescription_required ON medicines
+    BEGIN
+        {REFRESH_CARTS.format(condition="carts.id IN (SELECT cart_id FROM cart_items WHERE medicine_id = NEW.id)")};
+    END
+    """,
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS medicines_cart_totals",
+    "DROP TRIGGER IF EXISTS cart_items_cart_totals_delete",
+    "DROP TRIGGER IF EXISTS cart_items_cart_totals_update",
+    "DROP TRIGGER IF EXISTS cart_items_cart_totals_insert",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('carts', sa.Column('subtotal', sa.Numeric(precision=10, scale=2), server_default='0', nullable=False))
+    op.add_column('carts', sa.Column('item_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('carts', sa.Column('has_prescription_items', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        statements = POSTGRESQL_UPGRADE
+    elif dialect == 'sqlite':
+        statements = SQLITE_UPGRADE
+    else:
+        statements = []
+    for statement in statements:
+        op.execute(statement)
+
+    # Backfill existing carts
+    op.execute(REFRESH_CARTS.format(condition="1 = 1"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        statements = POSTGRESQL_DOWNGRADE
+    elif dialect == 'sqlite':
+        statements = SQLITE_DOWNGRADE
+    else:
+        statements = []
+    for statement in statements:
+        op.execute(statement)
+
+    with op.batch_alter_table('carts') as batch_op:
+        batch_op.drop_column('has_prescription_items')
+        batch_op.drop_column('item_count')
+        batch_op.drop_column('subtotal')
@@ -0,0 +1,64 @@
+"""Add composite order indexes for listing, search and stats
+
+Revision ID: 7a2d4e8c1b36
+Revises: 3c7e1d9b4f05
+Create Date: 2026-10-15 11:26:52.804113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2d4e8c1b36'
+down_revision: Union[str, Sequence[str], None] = '3c7e1d9b4f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+POSTGRESQL_UPGRADE = [
+    # get_user_orders: WHERE user_id = ? ORDER BY created_at DESC LIMIT ?
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_user_created "
+    "ON orders (user_id, created_at DESC)",
+    # search_orders filtered by status, newest first
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_status_created "
+    "ON orders (status, created_at DESC) WHERE status IS NOT NULL",
+    # search_orders date ranges; created_at grows with insertion order
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_created_at_brin "
+    "ON orders USING brin (created_at)",
+    # get_order_stats: per-status counts and revenue from the index alone
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_status_total "
+    "ON orders (status) INCLUDE (total_amount)",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_orders_status_total",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_orders_created_at_brin",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_orders_status_created",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_orders_user_created",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_UPGRADE:
+                op.execute(statement)
+    else:
+        op.create_index('ix_orders_user_created', 'orders', ['user_id', sa.text('created_at DESC')], unique=False)
+        op.create_index('ix_orders_status_created', 'orders', ['status', sa.text('created_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_DOWNGRADE:
+                op.execute(statement)
+    else:
+        op.drop_index('ix_orders_status_created', table_name='orders')
+        op.drop_index('ix_orders_user_created', table_name='orders')
@@ -0,0 +1,29 @@
+"""Add last_login_at to users
+
+Revision ID: 8d3f0a6c1e92
+Revises: 5b1c9e2f7a34
+Create Date: 2026-10-15 10:04:17.392851
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f0a6c1e92'
+down_revision: Union[str, Sequence[str], None] = '5b1c9e2f7a34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('last_login_at')
@@ -0,0 +1,58 @@
+"""Add earthdistance GiST indexes on pharmacy and delivery partner locations
+
+Revision ID: a4e7c2f9b815
+Revises: f8b2d5a9c361
+Create Date: 2026-10-15 15:06:12.604371
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e7c2f9b815'
+down_revision: Union[str, Sequence[str], None] = 'f8b2d5a9c361'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Nearby searches probe these with earth_box() instead of parsing every
+# {lat, lng} JSON row; cube and earthdistance ship with PostgreSQL contrib
+POSTGRESQL_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS cube",
+    "CREATE EXTENSION IF NOT EXISTS earthdistance",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pharmacies_location_earth "
+    "ON pharmacies USING gist "
+    "(ll_to_earth((location->>'lat')::float8, (location->>'lng')::float8))",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_delivery_partners_location_earth "
+    "ON delivery_partners USING gist "
+    "(ll_to_earth((current_location->>'lat')::float8, (current_location->>'lng')::float8))",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_delivery_partners_location_earth",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_pharmacies_location_earth",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for statement in POSTGRESQL_UPGRADE:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for statement in POSTGRESQL_DOWNGRADE:
+            op.execute(statement)
@@ -0,0 +1,50 @@
+"""Add (created_at, id) index to prescriptions for keyset pagination
+
+Revision ID: a7c2e9f4d1b3
+Revises: f3a9c7d2b810
+Create Date: 2026-10-15 13:37:26.904118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c2e9f4d1b3'
+down_revision: Union[str, Sequence[str], None] = 'f3a9c7d2b810'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Prescription search pages seek on (created_at, id), newest first
+POSTGRESQL_UPGRADE = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_prescriptions_created_id "
+    "ON prescriptions (created_at DESC, id DESC)",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_prescriptions_created_id",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_UPGRADE:
+                op.execute(statement)
+    else:
+        op.create_index('ix_prescriptions_created_id', 'prescriptions', [sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_DOWNGRADE:
+                op.execute(statement)
+    else:
+        op.drop_index('ix_prescriptions_created_id', table_name='prescriptions')
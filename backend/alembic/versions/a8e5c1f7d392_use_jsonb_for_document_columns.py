@@ -0,0 +1,56 @@
+"""Store document columns as jsonb on PostgreSQL
+
+Revision ID: a8e5c1f7d392
+Revises: f1d6b3a8c925
+Create Date: 2026-10-15 15:44:09.615230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8e5c1f7d392'
+down_revision: Union[str, Sequence[str], None] = 'f1d6b3a8c925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# JSON columns per table (JSONType in app.database.base). jsonb is parsed
+# once on write instead of on every read and supports @> and GIN indexes.
+# The earthdistance expression indexes on location are rebuilt by
+# PostgreSQL as part of the type change. SQLite has no jsonb, nothing to do
+JSON_COLUMNS = {
+    'users': ['medical_conditions', 'allergies', 'emergency_contact', 'delivery_addresses'],
+    'delivery_partners': ['current_location'],
+    'pharmacies': ['location', 'operating_hours'],
+    'medicines': ['side_effects', 'contraindications', 'active_ingredients'],
+    'prescriptions': ['extracted_medicines'],
+    'orders': ['delivery_address'],
+}
+
+
+def _convert_json_columns(column_type: str) -> None:
+    for table, columns in JSON_COLUMNS.items():
+        alterations = ", ".join(
+            f"ALTER COLUMN {column} TYPE {column_type} USING {column}::{column_type}"
+            for column in columns
+        )
+        op.execute(f"ALTER TABLE {table} {alterations}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _convert_json_columns('jsonb')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _convert_json_columns('json')
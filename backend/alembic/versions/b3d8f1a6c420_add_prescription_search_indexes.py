@@ -0,0 +1,55 @@
+"""Add prescription search indexes
+
+Revision ID: b3d8f1a6c420
+Revises: a7c2e9f4d1b3
+Create Date: 2026-10-15 14:02:15.736852
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d8f1a6c420'
+down_revision: Union[str, Sequence[str], None] = 'a7c2e9f4d1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Status-filtered searches read newest first; the GIN trigram index serves
+# the '%doctor%' ILIKE filter
+POSTGRESQL_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_prescriptions_status_created "
+    "ON prescriptions (status, created_at DESC, id DESC)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_prescriptions_doctor_name_trgm "
+    "ON prescriptions USING gin (doctor_name gin_trgm_ops)",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_prescriptions_doctor_name_trgm",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_prescriptions_status_created",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_UPGRADE:
+                op.execute(statement)
+    else:
+        op.create_index('ix_prescriptions_status_created', 'prescriptions', ['status', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_DOWNGRADE:
+                op.execute(statement)
+    else:
+        op.drop_index('ix_prescriptions_status_created', table_name='prescriptions')
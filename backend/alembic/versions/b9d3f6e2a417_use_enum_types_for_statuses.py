@@ -0,0 +1,82 @@
+"""Store order and prescription statuses as native enums on PostgreSQL
+
+Revision ID: b9d3f6e2a417
+Revises: a4e7c2f9b815
+Create Date: 2026-10-15 15:14:40.829163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d3f6e2a417'
+down_revision: Union[str, Sequence[str], None] = 'a4e7c2f9b815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ORDER_STATUSES = (
+    'pending', 'confirmed', 'processing', 'packed', 'shipped',
+    'out_for_delivery', 'delivered', 'cancelled', 'returned',
+)
+PRESCRIPTION_STATUSES = ('pending', 'processing', 'verified', 'rejected', 'expired')
+
+# order_stats_mv reads orders.status, so it is rebuilt around the type change
+ORDER_STATS_VIEW_DROP = "DROP MATERIALIZED VIEW IF EXISTS order_stats_mv"
+ORDER_STATS_VIEW_CREATE = [
+    """
+    CREATE MATERIALIZED VIEW order_stats_mv AS
+    SELECT status,
+           count(*) AS order_count,
+           COALESCE(sum(total_amount), 0) AS revenue
+    FROM orders
+    GROUP BY status
+    """,
+    "CREATE UNIQUE INDEX ix_order_stats_mv_status ON order_stats_mv (status)",
+]
+
+
+def _enum_values(values: Sequence[str]) -> str:
+    return ", ".join(f"'{value}'" for value in values)
+
+
+# 4-byte enum values instead of varchar keep the status indexes small
+POSTGRESQL_UPGRADE = [
+    f"CREATE TYPE order_status AS ENUM ({_enum_values(ORDER_STATUSES)})",
+    f"CREATE TYPE prescription_status AS ENUM ({_enum_values(PRESCRIPTION_STATUSES)})",
+    ORDER_STATS_VIEW_DROP,
+    "ALTER TABLE orders ALTER COLUMN status TYPE order_status USING status::order_status",
+    "ALTER TABLE prescriptions ALTER COLUMN status TYPE prescription_status "
+    "USING status::prescription_status",
+    *ORDER_STATS_VIEW_CREATE,
+]
+
+POSTGRESQL_DOWNGRADE = [
+    ORDER_STATS_VIEW_DROP,
+    "ALTER TABLE prescriptions ALTER COLUMN status TYPE VARCHAR(50) USING status::text",
+    "ALTER TABLE orders ALTER COLUMN status TYPE VARCHAR(50) USING status::text",
+    "DROP TYPE IF EXISTS prescription_status",
+    "DROP TYPE IF EXISTS order_status",
+    *ORDER_STATS_VIEW_CREATE,
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for statement in POSTGRESQL_UPGRADE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for statement in POSTGRESQL_DOWNGRADE:
+        op.execute(statement)
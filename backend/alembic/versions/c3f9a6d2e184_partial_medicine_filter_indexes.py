@@ -0,0 +1,69 @@
+"""Replace medicine stock and prescription flag indexes with partial indexes
+
+Revision ID: c3f9a6d2e184
+Revises: a8e5c1f7d392
+Create Date: 2026-10-15 15:52:37.408126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f9a6d2e184'
+down_revision: Union[str, Sequence[str], None] = 'a8e5c1f7d392'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+POSTGRESQL_UPGRADE = [
+    # search_medicines?in_stock=true, name order
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_medicines_in_stock "
+    "ON medicines (name, id) WHERE stock_quantity > 0",
+    # search_medicines?prescription_required=true, name order
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_medicines_rx "
+    "ON medicines (name, id) WHERE prescription_required",
+    # A boolean index is too unselective to be used, and every stock change
+    # had to update the stock index; ix_medicines_cat_rx_stock covers both
+    # columns behind a category filter
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_medicines_prescription_required",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_medicines_stock_quantity",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_medicines_stock_quantity "
+    "ON medicines (stock_quantity)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_medicines_prescription_required "
+    "ON medicines (prescription_required)",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_medicines_rx",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_medicines_in_stock",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_UPGRADE:
+                op.execute(statement)
+    else:
+        op.create_index('ix_medicines_in_stock', 'medicines', ['name', 'id'], unique=False, sqlite_where=sa.text('stock_quantity > 0'))
+        op.create_index('ix_medicines_rx', 'medicines', ['name', 'id'], unique=False, sqlite_where=sa.text('prescription_required'))
+        op.drop_index('ix_medicines_prescription_required', table_name='medicines')
+        op.drop_index('ix_medicines_stock_quantity', table_name='medicines')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_DOWNGRADE:
+                op.execute(statement)
+    else:
+        op.create_index('ix_medicines_stock_quantity', 'medicines', ['stock_quantity'], unique=False)
+        op.create_index('ix_medicines_prescription_required', 'medicines', ['prescription_required'], unique=False)
+        op.drop_index('ix_medicines_rx', table_name='medicines')
+        op.drop_index('ix_medicines_in_stock', table_name='medicines')
@@ -0,0 +1,55 @@
+"""Add order_stats_mv materialized view
+
+Revision ID: c41f6b2e9d58
+Revises: 7a2d4e8c1b36
+Create Date: 2026-10-15 11:58:09.611347
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f6b2e9d58'
+down_revision: Union[str, Sequence[str], None] = '7a2d4e8c1b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Per-status order counts and revenue for /orders/stats/overview; the unique
+# index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+POSTGRESQL_UPGRADE = [
+    """
+    CREATE MATERIALIZED VIEW order_stats_mv AS
+    SELECT status,
+           count(*) AS order_count,
+           COALESCE(sum(total_amount), 0) AS revenue
+    FROM orders
+    GROUP BY status
+    """,
+    "CREATE UNIQUE INDEX ix_order_stats_mv_status ON order_stats_mv (status)",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP MATERIALIZED VIEW IF EXISTS order_stats_mv",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for statement in POSTGRESQL_UPGRADE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for statement in POSTGRESQL_DOWNGRADE:
+        op.execute(statement)
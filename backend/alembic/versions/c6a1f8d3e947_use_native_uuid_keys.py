@@ -0,0 +1,111 @@
+"""Store primary and foreign keys as native uuid on PostgreSQL
+
+Revision ID: c6a1f8d3e947
+Revises: d9e4b7c1a258
+Create Date: 2026-10-15 14:51:07.382915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a1f8d3e947'
+down_revision: Union[str, Sequence[str], None] = 'd9e4b7c1a258'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Key columns per table; 16-byte uuid instead of 36-character varchar keeps
+# the primary key, foreign key and composite indexes less than half the size.
+# SQLite keeps the text form, so there is nothing to do there
+UUID_COLUMNS = {
+    'users': ['id'],
+    'categories': ['id', 'parent_category_id'],
+    'delivery_partners': ['id'],
+    'pharmacies': ['id'],
+    'medicines': ['id', 'category_id'],
+    'carts': ['id', 'user_id'],
+    'prescriptions': ['id', 'user_id', 'verified_by'],
+    'orders': ['id', 'user_id', 'delivery_partner_id', 'pharmacy_id'],
+    'cart_items': ['id', 'cart_id', 'medicine_id', 'prescription_id'],
+    'order_items': ['id', 'order_id', 'medicine_id', 'prescription_id'],
+    'pharmacy_medicines': ['id', 'pharmacy_id', 'medicine_id'],
+}
+
+# Foreign keys must be dropped while both ends change type, then re-created
+# from their saved definitions
+POSTGRESQL_FOREIGN_KEYS = """
+    SELECT conrelid::regclass::text AS table_name,
+           conname AS name,
+           pg_get_constraintdef(oid) AS definition
+    FROM pg_constraint
+    WHERE contype = 'f' AND connamespace = 'public'::regnamespace
+"""
+
+# The cart totals trigger helper takes a cart id, so its signature follows
+# the column type
+REFRESH_CART_TOTALS = """
+    CREATE OR REPLACE FUNCTION refresh_cart_totals(p_cart_id {arg_type}) RETURNS void AS $$
+    BEGIN
+        UPDATE carts SET
+            subtotal = COALESCE(t.subtotal, 0),
+            item_count = t.item_count,
+            has_prescription_items = COALESCE(t.has_prescription_items, false)
+        FROM (
+            SELECT SUM(ci.quantity * m.price) AS subtotal,
+                   COUNT(ci.id) AS item_count,
+                   BOOL_OR(m.prescription_required) AS has_prescription_items
+            FROM cart_items ci
+            JOIN medicines m ON m.id = ci.medicine_id
+            WHERE ci.cart_id = p_cart_id
+        ) AS t
+        WHERE carts.id = p_cart_id;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def _convert_key_columns(column_type: str) -> None:
+    """Change every key column to column_type, keeping the foreign keys."""
+    foreign_keys = [
+        row for row in op.get_bind().execute(sa.text(POSTGRESQL_FOREIGN_KEYS))
+        if row.table_name in UUID_COLUMNS
+    ]
+
+    for fk in foreign_keys:
+        op.execute(f'ALTER TABLE {fk.table_name} DROP CONSTRAINT "{fk.name}"')
+
+    for table, columns in UUID_COLUMNS.items():
+        alterations = ", ".join(
+            f"ALTER COLUMN {column} TYPE {column_type} USING {column}::{column_type}"
+            for column in columns
+        )
+        op.execute(f"ALTER TABLE {table} {alterations}")
+
+    for fk in foreign_keys:
+        op.execute(f'ALTER TABLE {fk.table_name} ADD CONSTRAINT "{fk.name}" {fk.definition}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _convert_key_columns('uuid')
+
+    op.execute("DROP FUNCTION IF EXISTS refresh_cart_totals(VARCHAR)")
+    op.execute(REFRESH_CART_TOTALS.format(arg_type='UUID'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _convert_key_columns('varchar')
+
+    op.execute("DROP FUNCTION IF EXISTS refresh_cart_totals(UUID)")
+    op.execute(REFRESH_CART_TOTALS.format(arg_type='VARCHAR'))
@@ -0,0 +1,29 @@
+"""Add OCR text to prescriptions
+
+Revision ID: d9e4b7c1a258
+Revises: b3d8f1a6c420
+Create Date: 2026-10-15 14:26:48.310527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e4b7c1a258'
+down_revision: Union[str, Sequence[str], None] = 'b3d8f1a6c420'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('prescriptions', sa.Column('ocr_text', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('prescriptions') as batch_op:
+        batch_op.drop_column('ocr_text')
@@ -0,0 +1,57 @@
+"""Generate primary key uuids in the database on PostgreSQL
+
+Revision ID: e2c7a9d4b618
+Revises: b9d3f6e2a417
+Create Date: 2026-10-15 15:22:18.407356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c7a9d4b618'
+down_revision: Union[str, Sequence[str], None] = 'b9d3f6e2a417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables keyed by uuid_pk. The ORM already puts the generator in the INSERT
+# itself; the column default covers rows written by plain SQL
+TABLES = (
+    'users', 'categories', 'delivery_partners', 'pharmacies', 'medicines',
+    'carts', 'prescriptions', 'orders', 'cart_items', 'order_items',
+    'pharmacy_medicines',
+)
+
+# gen_random_uuid() is built in from PostgreSQL 13; pgcrypto provides it on
+# older servers
+POSTGRESQL_UPGRADE = ["CREATE EXTENSION IF NOT EXISTS pgcrypto"] + [
+    f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()"
+    for table in TABLES
+]
+POSTGRESQL_DOWNGRADE = [
+    f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT"
+    for table in TABLES
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite keeps its tables as they are: the id expression is rendered into
+    # each INSERT, so no column default is needed there
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for statement in POSTGRESQL_UPGRADE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for statement in POSTGRESQL_DOWNGRADE:
+        op.execute(statement)
@@ -0,0 +1,55 @@
+"""Add id to the user orders index for keyset pagination
+
+Revision ID: e5b8a1f3c742
+Revises: c41f6b2e9d58
+Create Date: 2026-10-15 12:31:40.275918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8a1f3c742'
+down_revision: Union[str, Sequence[str], None] = 'c41f6b2e9d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Order history pages seek on (created_at, id); the index must cover both
+POSTGRESQL_UPGRADE = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_user_created_id "
+    "ON orders (user_id, created_at DESC, id DESC)",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_orders_user_created",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_user_created "
+    "ON orders (user_id, created_at DESC)",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_orders_user_created_id",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_UPGRADE:
+                op.execute(statement)
+    else:
+        op.create_index('ix_orders_user_created_id', 'orders', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+        op.drop_index('ix_orders_user_created', table_name='orders')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_DOWNGRADE:
+                op.execute(statement)
+    else:
+        op.create_index('ix_orders_user_created', 'orders', ['user_id', sa.text('created_at DESC')], unique=False)
+        op.drop_index('ix_orders_user_created_id', table_name='orders')
@@ -0,0 +1,129 @@
+"""Store money amounts as whole paise in BIGINT columns
+
+Revision ID: f1d6b3a8c925
+Revises: e2c7a9d4b618
+Create Date: 2026-10-15 15:31:52.164083
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d6b3a8c925'
+down_revision: Union[str, Sequence[str], None] = 'e2c7a9d4b618'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Money columns per table (the Money type in app.database.base)
+MONEY_COLUMNS = {
+    'medicines': ['price'],
+    'pharmacy_medicines': ['price'],
+    'orders': ['total_amount'],
+    'order_items': ['unit_price', 'total_price'],
+    'carts': ['subtotal'],
+}
+
+# order_stats_mv sums orders.total_amount and medicines_cart_totals watches
+# medicines.price, so both are rebuilt around the type change
+ORDER_STATS_VIEW_DROP = "DROP MATERIALIZED VIEW IF EXISTS order_stats_mv"
+ORDER_STATS_VIEW_CREATE = [
+    """
+    CREATE MATERIALIZED VIEW order_stats_mv AS
+    SELECT status,
+           count(*) AS order_count,
+           COALESCE(sum(total_amount), 0) AS revenue
+    FROM orders
+    GROUP BY status
+    """,
+    "CREATE UNIQUE INDEX ix_order_stats_mv_status ON order_stats_mv (status)",
+]
+MEDICINES_TRIGGER_DROP = "DROP TRIGGER IF EXISTS medicines_cart_totals ON medicines"
+MEDICINES_TRIGGER_CREATE = """
+    CREATE TRIGGER medicines_cart_totals
+    AFTER UPDATE OF price, prescription_required ON medicines
+    FOR EACH ROW
+    WHEN (OLD.price IS DISTINCT FROM NEW.price
+          OR OLD.prescription_required IS DISTINCT FROM NEW.prescription_required)
+    EXECUTE FUNCTION medicines_refresh_cart_totals()
+"""
+
+
+def _alter_money_columns(column_type: str, using: str) -> list:
+    return [
+        f"ALTER TABLE {table} " + ", ".join(
+            f"ALTER COLUMN {column} TYPE {column_type} USING {using.format(column=column)}"
+            for column in columns
+        )
+        for table, columns in MONEY_COLUMNS.items()
+    ]
+
+
+POSTGRESQL_UPGRADE = [
+    ORDER_STATS_VIEW_DROP,
+    MEDICINES_TRIGGER_DROP,
+    *_alter_money_columns('BIGINT', 'round({column} * 100)::bigint'),
+    MEDICINES_TRIGGER_CREATE,
+    *ORDER_STATS_VIEW_CREATE,
+]
+
+POSTGRESQL_DOWNGRADE = [
+    ORDER_STATS_VIEW_DROP,
+    MEDICINES_TRIGGER_DROP,
+    *_alter_money_columns('NUMERIC(10, 2)', '{column} / 100.0'),
+    MEDICINES_TRIGGER_CREATE,
+    *ORDER_STATS_VIEW_CREATE,
+]
+
+# SQLite column types are only affinities; rewriting the values is enough.
+# Cart subtotals are recomputed last since the medicines trigger may already
+# have refreshed some of them from the new prices
+SQLITE_CART_SUBTOTALS = """
+    UPDATE carts SET subtotal = (
+        SELECT COALESCE(SUM(ci.quantity * m.price), 0)
+        FROM cart_items ci JOIN medicines m ON m.id = ci.medicine_id
+        WHERE ci.cart_id = carts.id
+    )
+"""
+
+
+def _update_money_values(expression: str) -> list:
+    return [
+        f"UPDATE {table} SET " + ", ".join(
+            f"{column} = {expression.format(column=column)}" for column in columns
+        )
+        for table, columns in MONEY_COLUMNS.items()
+        if table != 'carts'
+    ] + [SQLITE_CART_SUBTOTALS]
+
+
+SQLITE_UPGRADE = _update_money_values('CAST(round({column} * 100) AS INTEGER)')
+SQLITE_DOWNGRADE = _update_money_values('round({column} / 100.0, 2)')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        statements = POSTGRESQL_UPGRADE
+    elif dialect == 'sqlite':
+        statements = SQLITE_UPGRADE
+    else:
+        statements = []
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        statements = POSTGRESQL_DOWNGRADE
+    elif dialect == 'sqlite':
+        statements = SQLITE_DOWNGRADE
+    else:
+        statements = []
+    for statement in statements:
+        op.execute(statement)
@@ -0,0 +1,59 @@
+"""Add full-text search document to medicines
+
+Revision ID: f3a9c7d2b810
+Revises: e5b8a1f3c742
+Create Date: 2026-10-15 13:04:52.180463
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c7d2b810'
+down_revision: Union[str, Sequence[str], None] = 'e5b8a1f3c742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Stored generated tsvector kept in sync by PostgreSQL itself; multi-word
+# searches match it through the GIN index instead of chained ILIKEs
+POSTGRESQL_ADD_COLUMN = """
+    ALTER TABLE medicines ADD COLUMN IF NOT EXISTS search_doc tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('english',
+            coalesce(name, '') || ' ' ||
+            coalesce(generic_name, '') || ' ' ||
+            coalesce(manufacturer, ''))
+    ) STORED
+"""
+
+POSTGRESQL_CREATE_INDEX = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_medicines_fts "
+    "ON medicines USING gin (search_doc)"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(POSTGRESQL_ADD_COLUMN)
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(POSTGRESQL_CREATE_INDEX)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_medicines_fts")
+
+    op.execute("ALTER TABLE medicines DROP COLUMN IF EXISTS search_doc")
@@ -0,0 +1,67 @@
+"""Add composite indexes for filtered order history, medicine and stock lookups
+
+Revision ID: f8b2d5a9c361
+Revises: c6a1f8d3e947
+Create Date: 2026-10-15 14:58:33.217406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8b2d5a9c361'
+down_revision: Union[str, Sequence[str], None] = 'c6a1f8d3e947'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+POSTGRESQL_UPGRADE = [
+    # get_user_orders?status=: WHERE user_id = ? AND status = ? newest first
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_user_status_created "
+    "ON orders (user_id, status, created_at DESC, id DESC)",
+    # list_medicines filtered by category, prescription flag and stock
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_medicines_cat_rx_stock "
+    "ON medicines (category_id, prescription_required, stock_quantity)",
+    # Stock by medicine across pharmacies; replaces the medicine_id index
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pharmacy_medicines_medicine_stock "
+    "ON pharmacy_medicines (medicine_id, stock_quantity)",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_pharmacy_medicines_medicine_id",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pharmacy_medicines_medicine_id "
+    "ON pharmacy_medicines (medicine_id)",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_pharmacy_medicines_medicine_stock",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_medicines_cat_rx_stock",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_orders_user_status_created",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_UPGRADE:
+                op.execute(statement)
+    else:
+        op.create_index('ix_orders_user_status_created', 'orders', ['user_id', 'status', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+        op.create_index('ix_medicines_cat_rx_stock', 'medicines', ['category_id', 'prescription_required', 'stock_quantity'], unique=False)
+        op.create_index('ix_pharmacy_medicines_medicine_stock', 'pharmacy_medicines', ['medicine_id', 'stock_quantity'], unique=False)
+        op.drop_index('ix_pharmacy_medicines_medicine_id', table_name='pharmacy_medicines')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for statement in POSTGRESQL_DOWNGRADE:
+                op.execute(statement)
+    else:
+        op.create_index('ix_pharmacy_medicines_medicine_id', 'pharmacy_medicines', ['medicine_id'], unique=False)
+        op.drop_index('ix_pharmacy_medicines_medicine_stock', table_name='pharmacy_medicines')
+        op.drop_index('ix_medicines_cat_rx_stock', table_name='medicines')
+        op.drop_index('ix_orders_user_status_created', table_name='orders')
@@ -2,8 +2,9 @@
 Main API router for v1
 """
 
-from fastapi import APIRouter
-from app.api.api_v1.endpoints import auth, categories, medicines, prescriptions, cart, orders
+import json
+from fastapi import APIRouter, Response
+from app.api.api_v1.endpoints import auth, categories, medicines, prescriptions, cart, orders, pharmacies, batch
 
 api_router = APIRouter()
 
@@ -14,13 +15,18 @@ api_router.include_router(medicines.router, prefix="/medicines", tags=["medicine
 api_router.include_router(prescriptions.router, prefix="/prescriptions", tags=["prescriptions"])
 api_router.include_router(cart.router, prefix="/cart", tags=["cart"])
 api_router.include_router(orders.router, prefix="/orders", tags=["orders"])
+api_router.include_router(pharmacies.router, prefix="/pharmacies", tags=["pharmacies"])
+api_router.include_router(batch.router, tags=["batch"])
+
+# Health check endpoint (constant payload, serialized once at import)
+HEALTH_RESPONSE_BODY = json.dumps({
+    "status": "healthy",
+    "version": "1.0.0",
+    "api": "v1"
+}, separators=(",", ":")).encode()
+
 
-# Health check endpoint
 @api_router.get("/health")
-async def health_check():
+async def health_check() -> Response:
     """API health check"""
-    return {
-        "status": "healthy",
-        "version": "1.0.0",
-        "api": "v1"
-    }
+    return Response(content=HEALTH_RESPONSE_BODY, media_type="application/json")
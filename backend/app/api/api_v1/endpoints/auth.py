@@ -2,35 +2,133 @@
 Authentication endpoints
 """
 
+import copy
+import hashlib
+import threading
+import time
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, func, insert, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from app.database.session import get_db
 from app.models.user import User
 from app.models.cart import Cart
 from app.schemas.user import UserCreate, UserLogin, UserResponse, UserWithTokens, PhoneVerification
-from app.core.security import verify_password, get_password_hash, create_token_pair, verify_token
-from typing import Dict, Any
+from app.core.security import verify_password_async, get_password_hash_async, create_token_pair, verify_token_claims
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
 router = APIRouter()
 security = HTTPBearer()
 
+# Short-lived cache of authenticated users keyed by a digest of the bearer token.
+# The TTL bounds how long a revoked or changed user can keep a cached session.
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+_token_keys_by_user: TTLCache = TTLCache(maxsize=10000, ttl=30)
+_token_cache_lock = threading.Lock()
+
+_USER_COLUMNS = frozenset(User.__table__.columns.keys())
+
+
+class _CachedUser(NamedTuple):
+    """Copy of a user's column values taken at authentication time"""
+    user_id: str
+    # Token expiry (UNIX timestamp); the entry is unusable after it
+    expires_at: Optional[float]
+    columns: Tuple[Tuple[str, Any], ...]
+
+
+def _token_cache_key(token_str: str) -> bytes:
+    """Digest used as the token cache key (raw tokens are never stored)"""
+    return hashlib.sha256(token_str.encode()).digest()[:16]
+
+
+def _cache_token_user(cache_key: bytes, user: User, expires_at: Optional[float]) -> None:
+    """
+    Remember the authenticated user for a token
+
+    Only a deep copy of the loaded column values is kept, never the mapped
+    instance: that one belongs to the request's session and may change.
+    """
+    columns = tuple(
+        (key, copy.deepcopy(value))
+        for key, value in inspect(user).dict.items()
+        if key in _USER_COLUMNS
+    )
+    entry = _CachedUser(str(user.id), expires_at, columns)
+    with _token_cache_lock:
+        _token_cache[cache_key] = entry
+        # Prune keys the TTL cache has already expired or evicted
+        user_keys = {
+            key for key in _token_keys_by_user.get(entry.user_id, set())
+            if key in _token_cache
+        }
+        user_keys.add(cache_key)
+        _token_keys_by_user[entry.user_id] = user_keys
+
+
+def _user_from_cache(entry: _CachedUser) -> User:
+    """Build a fresh detached, unmodified User from a cache entry"""
+    user = User(**{key: copy.deepcopy(value) for key, value in entry.columns})
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate_user_tokens(user_id: str) -> None:
+    """
+    Drop every cached token entry for a user.
+
+    Call this whenever the user's auth-relevant state changes
+    (phone verification, password change, deactivation).
+    """
+    with _token_cache_lock:
+        for key in _token_keys_by_user.pop(str(user_id), set()):
+            _token_cache.pop(key, None)
+
 
 @router.post("/register", response_model=UserWithTokens, status_code=status.HTTP_201_CREATED)
-def register_user(
+async def register_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Register a new user with medical profile
     """
-    # Check if user already exists
-    existing_user = db.query(User).filter(
-        (User.email == user_data.email) | (User.phone == user_data.phone)
-    ).first()
+    # Hash password (CPU-bound, runs in the hashing thread pool)
+    hashed_password = await get_password_hash_async(user_data.password)
+    
+    # Create user; the unique email/phone indexes reject duplicates atomically
+    dialect_insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    result = await db.execute(
+        dialect_insert(User)
+        .values(
+            email=user_data.email,
+            phone=user_data.phone,
+            password_hash=hashed_password,
+            first_name=user_data.first_name,
+            last_name=user_data.last_name,
+            date_of_birth=user_data.date_of_birth,
+            medical_conditions=user_data.medical_conditions,
+            allergies=user_data.allergies,
+            emergency_contact=user_data.emergency_contact.model_dump() if user_data.emergency_contact else None,
+            delivery_addresses=[addr.model_dump() for addr in user_data.delivery_addresses] if user_data.delivery_addresses else None,
+            phone_verified=False
+        )
+        .on_conflict_do_nothing()
+        .returning(User)
+    )
+    new_user = result.scalars().first()
     
-    if existing_user:
-        if existing_user.email == user_data.email:
+    if not new_user:
+        await db.rollback()
+        # Find out which field conflicted for the error message
+        email_taken = await db.scalar(
+            select(exists().where(User.email == user_data.email))
+        )
+        if email_taken:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="User with this email already exists"
@@ -40,33 +138,11 @@ def register_user(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="User with this phone number already exists"
             )
-    
-    # Hash password
-    hashed_password = get_password_hash(user_data.password)
-    
-    # Create user
-    new_user = User(
-        email=user_data.email,
-        phone=user_data.phone,
-        password_hash=hashed_password,
-        first_name=user_data.first_name,
-        last_name=user_data.last_name,
-        date_of_birth=user_data.date_of_birth,
-        medical_conditions=user_data.medical_conditions,
-        allergies=user_data.allergies,
-        emergency_contact=user_data.emergency_contact.dict() if user_data.emergency_contact else None,
-        delivery_addresses=[addr.dict() for addr in user_data.delivery_addresses] if user_data.delivery_addresses else None,
-        phone_verified=False
-    )
-    
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-
-    # Create cart for user
-    new_cart = Cart(user_id=new_user.id)
-    db.add(new_cart)
-    db.commit()
+
+    # Create cart for user in the same transaction (plain Core INSERT, no
+    # ORM object to track) so registration ends with a single COMMIT
+    await db.execute(insert(Cart).values(user_id=new_user.id))
+    await db.commit()
     
     # Generate tokens
     tokens = create_token_pair(new_user.id)
@@ -78,31 +154,44 @@ def register_user(
 
 
 @router.post("/login", response_model=UserWithTokens)
-def login_user(
+async def login_user(
     login_data: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     User login with email and password
     """
-    # Find user by email
-    user = db.query(User).filter(User.email == login_data.email).first()
+    # Find user by email and stamp the login in the same statement
+    result = await db.execute(
+        update(User)
+        .where(User.email == login_data.email)
+        .values(last_login_at=func.now(), updated_at=User.updated_at)
+        .returning(User)
+    )
+    user = result.scalars().first()
     
     if not user:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
-    # Verify password
-    if not verify_password(login_data.password, user.password_hash):
+    # Verify password; roll back so a failed attempt does not count as a login
+    if not await verify_password_async(login_data.password, user.password_hash):
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
+    await db.commit()
     
-    # Generate tokens
+    # Generate tokens and prime the auth cache so an immediate /me skips the
+    # DB; entries for the user's other tokens hold the old login time
     tokens = create_token_pair(user.id)
+    invalidate_user_tokens(user.id)
+    _, expires_at = verify_token_claims(tokens["access_token"])
+    _cache_token_user(_token_cache_key(tokens["access_token"]), user, expires_at)
     
     return {
         "user": UserResponse.model_validate(user),
@@ -110,38 +199,50 @@ def login_user(
     }
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Get current authenticated user
     """
     # Extract token from Bearer scheme
     token_str = token.credentials
+    cache_key = _token_cache_key(token_str)
+
+    # Cache hit skips JWT verification and the user lookup, but not the
+    # token's own expiry; the session gets its own copy of the user
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+    if cached is not None and (cached.expires_at is None or cached.expires_at > time.time()):
+        return await db.merge(_user_from_cache(cached), load=False)
 
     # Verify token
-    user_id = verify_token(token_str)
-    if not user_id:
+    claims = verify_token_claims(token_str)
+    if not claims:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
+    user_id, expires_at = claims
 
     # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
+
+    _cache_token_user(cache_key, user, expires_at)
     
     return user
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_profile(
+async def get_current_user_profile(
     current_user: User = Depends(get_current_user)
 ) -> UserResponse:
     """
@@ -151,9 +252,9 @@ def get_current_user_profile(
 
 
 @router.post("/verify-phone")
-def verify_phone_number(
+async def verify_phone_number(
     verification_data: PhoneVerification,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Verify phone number with OTP
@@ -167,7 +268,8 @@ def verify_phone_number(
         )
 
     # Find user by phone
-    user = db.query(User).filter(User.phone == verification_data.phone).first()
+    result = await db.execute(select(User).where(User.phone == verification_data.phone))
+    user = result.scalar_one_or_none()
 
     if not user:
         raise HTTPException(
@@ -177,7 +279,8 @@ def verify_phone_number(
 
     # Update phone verification status
     user.phone_verified = True
-    db.commit()
+    await db.commit()
+    invalidate_user_tokens(user.id)
     
     return {
         "message": "Phone number verified successfully",
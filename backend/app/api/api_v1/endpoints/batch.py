@@ -0,0 +1,94 @@
+"""
+Batch request endpoint
+"""
+
+import asyncio
+import json
+from fastapi import APIRouter, Request
+from typing import Any, Dict, List, Tuple
+from app.core.config import settings
+from app.schemas.batch import BatchRequest, BatchRequestItem, BatchResponse, BatchResponseItem
+
+router = APIRouter()
+
+# Headers from the outer request that every sub-request inherits
+FORWARDED_HEADERS = {"authorization", "host", "accept-language", "user-agent"}
+
+
+async def _dispatch(request: Request, item: BatchRequestItem) -> BatchResponseItem:
+    """
+    Run one sub-request through the ASGI app and capture its response
+    """
+    if item.method.upper() != "GET":
+        return BatchResponseItem(id=item.id, status=405, body={"detail": "Only GET sub-requests are supported"})
+
+    path, _, query = item.url.partition("?")
+    if not path.startswith("/") or path.rstrip("/").startswith("/batch"):
+        return BatchResponseItem(id=item.id, status=400, body={"detail": "Invalid sub-request URL"})
+    path = settings.API_V1_STR + path
+
+    headers: List[Tuple[bytes, bytes]] = [
+        (name, value) for name, value in request.scope["headers"]
+        if name.decode("latin-1") in FORWARDED_HEADERS
+    ]
+    for name, value in (item.headers or {}).items():
+        headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+
+    scope: Dict[str, Any] = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": request.scope.get("scheme", "http"),
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": request.scope.get("root_path", ""),
+        "query_string": query.encode(),
+        "headers": headers,
+        "client": request.scope.get("client"),
+        "server": request.scope.get("server"),
+        "state": {},
+    }
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status_code = 500
+    response_headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            response_headers.update(
+                (k.decode("latin-1").lower(), v.decode("latin-1")) for k, v in message.get("headers", [])
+            )
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await request.app(scope, receive, send)
+
+    raw_body = b"".join(chunks)
+    if response_headers.get("content-type", "").startswith("application/json"):
+        body = json.loads(raw_body) if raw_body else None
+    else:
+        body = raw_body.decode("utf-8", errors="replace")
+
+    return BatchResponseItem(id=item.id, status=status_code, body=body)
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(
+    batch_request: BatchRequest,
+    request: Request
+) -> BatchResponse:
+    """
+    Execute several read-only API calls in one round-trip
+
+    Sub-requests run concurrently and inherit the caller's Authorization header.
+    """
+    responses = await asyncio.gather(
+        *(_dispatch(request, item) for item in batch_request.requests)
+    )
+    return BatchResponse(responses=list(responses))
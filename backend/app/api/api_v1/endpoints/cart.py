@@ -3,13 +3,15 @@ Shopping cart management endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, delete, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any
 from app.database.session import get_db
 from app.models.cart import Cart, CartItem
 from app.models.medicine import Medicine
 from app.models.prescription import Prescription
 from app.models.user import User
+from app.schemas.common import UUIDPath
 from app.schemas.cart import (
     CartResponse, CartItemResponse, AddToCartRequest, UpdateCartItemRequest,
     CartSummary, CartValidationResult, CartCheckoutRequest, BulkCartOperation,
@@ -22,59 +24,81 @@ router = APIRouter()
 
 
 @router.get("/", response_model=CartResponse)
-def get_cart(
-    db: Session = Depends(get_db),
+async def get_cart(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> CartResponse:
     """
     Get current user's cart with all items
     """
     cart_service = CartService(db)
-    cart = cart_service.get_or_create_cart(current_user.id)
+    cart = await cart_service.get_or_create_cart(current_user.id)
     
-    # Load cart items with medicine details
-    cart_items = db.query(CartItem).options(
-        joinedload(CartItem.medicine)
-    ).filter(CartItem.cart_id == cart.id).all()
+    # Load cart items with the medicine fields the response needs
+    result = await db.execute(
+        select(
+            CartItem,
+            Medicine.name,
+            Medicine.generic_name,
+            Medicine.manufacturer,
+            Medicine.price,
+            Medicine.prescription_required,
+            Medicine.stock_quantity,
+        )
+        .join(Medicine, Medicine.id == CartItem.medicine_id)
+        .where(CartItem.cart_id == cart.id)
+    )
+    rows = result.all()
     
-    # Calculate totals
-    subtotal = sum(item.quantity * item.medicine.price for item in cart_items)
+    # Calculate totals from the trigger-maintained cart columns
+    subtotal = float(cart.subtotal)
     tax_amount = subtotal * 0.18  # 18% GST
     delivery_fee = 50.0 if subtotal < 500 else 0.0  # Free delivery above ₹500
     total_amount = subtotal + tax_amount + delivery_fee
     
     # Check for prescription items
-    has_prescription_items = any(item.medicine.prescription_required for item in cart_items)
+    has_prescription_items = cart.has_prescription_items
+    
+    # Load all referenced prescriptions in one query for validation
+    prescriptions = await cart_service.get_prescriptions(
+        row.CartItem.prescription_id for row in rows if row.prescription_required
+    )
     
     # Build response
-    cart_response = CartResponse(
-        id=cart.id,
-        user_id=cart.user_id,
-        items=[
-            CartItemResponse(
+    items = []
+    for row in rows:
+        item = row.CartItem
+        items.append(
+            CartItemResponse.model_construct(
                 id=item.id,
                 cart_id=item.cart_id,
                 medicine_id=item.medicine_id,
                 quantity=item.quantity,
                 prescription_id=item.prescription_id,
                 notes=item.notes,
-                unit_price=item.medicine.price,
-                total_price=item.quantity * item.medicine.price,
+                unit_price=row.price,
+                total_price=item.quantity * row.price,
                 medicine={
-                    "id": item.medicine.id,
-                    "name": item.medicine.name,
-                    "generic_name": item.medicine.generic_name,
-                    "manufacturer": item.medicine.manufacturer,
-                    "price": item.medicine.price,
-                    "prescription_required": item.medicine.prescription_required,
-                    "stock_quantity": item.medicine.stock_quantity
+                    "id": item.medicine_id,
+                    "name": row.name,
+                    "generic_name": row.generic_name,
+                    "manufacturer": row.manufacturer,
+                    "price": row.price,
+                    "prescription_required": row.prescription_required,
+                    "stock_quantity": row.stock_quantity
                 },
-                is_prescription_valid=cart_service.validate_prescription_for_item(item),
+                is_prescription_valid=cart_service.validate_prescription_for_item(item, row, prescriptions),
                 created_at=item.created_at,
                 updated_at=item.updated_at
-            ) for item in cart_items
-        ],
-        total_items=len(cart_items),
+            )
+        )
+    
+    # Data comes from the database, so skip re-validation on this hot path
+    cart_response = CartResponse.model_construct(
+        id=cart.id,
+        user_id=cart.user_id,
+        items=items,
+        total_items=len(items),
         subtotal=subtotal,
         tax_amount=tax_amount,
         delivery_fee=delivery_fee,
@@ -89,9 +113,9 @@ def get_cart(
 
 
 @router.post("/items", response_model=CartItemResponse, status_code=status.HTTP_201_CREATED)
-def add_to_cart(
+async def add_to_cart(
     item_data: AddToCartRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> CartItemResponse:
     """
@@ -100,15 +124,33 @@ def add_to_cart(
     cart_service = CartService(db)
     
     # Get or create cart
-    cart = cart_service.get_or_create_cart(current_user.id)
+    cart = await cart_service.get_or_create_cart(current_user.id)
     
-    # Get medicine
-    medicine = db.query(Medicine).filter(Medicine.id == item_data.medicine_id).first()
-    if not medicine:
+    # Get medicine, the existing cart line and the prescription in one query
+    stmt = (
+        select(Medicine, CartItem)
+        .outerjoin(
+            CartItem,
+            and_(CartItem.cart_id == cart.id, CartItem.medicine_id == Medicine.id)
+        )
+        .where(Medicine.id == item_data.medicine_id)
+    )
+    if item_data.prescription_id:
+        stmt = stmt.add_columns(Prescription).outerjoin(
+            Prescription,
+            and_(
+                Prescription.id == item_data.prescription_id,
+                Prescription.user_id == current_user.id
+            )
+        )
+    result = await db.execute(stmt)
+    row = result.first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Medicine not found"
         )
+    medicine, existing_item = row[0], row[1]
     
     # Check stock availability
     if medicine.stock_quantity < item_data.quantity:
@@ -126,10 +168,7 @@ def add_to_cart(
     
     # Validate prescription if provided
     if item_data.prescription_id:
-        prescription = db.query(Prescription).filter(
-            Prescription.id == item_data.prescription_id,
-            Prescription.user_id == current_user.id
-        ).first()
+        prescription = row[2]
         
         if not prescription:
             raise HTTPException(
@@ -143,12 +182,6 @@ def add_to_cart(
                 detail="Prescription must be verified before use"
             )
     
-    # Check if item already exists in cart
-    existing_item = db.query(CartItem).filter(
-        CartItem.cart_id == cart.id,
-        CartItem.medicine_id == item_data.medicine_id
-    ).first()
-    
     if existing_item:
         # Update quantity
         new_quantity = existing_item.quantity + item_data.quantity
@@ -163,8 +196,8 @@ def add_to_cart(
         if item_data.prescription_id:
             existing_item.prescription_id = item_data.prescription_id
         
-        db.commit()
-        db.refresh(existing_item)
+        await db.commit()
+        await db.refresh(existing_item)
         cart_item = existing_item
     else:
         # Create new cart item
@@ -176,85 +209,91 @@ def add_to_cart(
             notes=item_data.notes
         )
         db.add(cart_item)
-        db.commit()
-        db.refresh(cart_item)
-    
-    # Load medicine details for response
-    cart_item_with_medicine = db.query(CartItem).options(
-        joinedload(CartItem.medicine)
-    ).filter(CartItem.id == cart_item.id).first()
+        await db.commit()
+        await db.refresh(cart_item)
     
+    # Build response from the medicine loaded above
     return CartItemResponse(
-        id=cart_item_with_medicine.id,
-        cart_id=cart_item_with_medicine.cart_id,
-        medicine_id=cart_item_with_medicine.medicine_id,
-        quantity=cart_item_with_medicine.quantity,
-        prescription_id=cart_item_with_medicine.prescription_id,
-        notes=cart_item_with_medicine.notes,
-        unit_price=cart_item_with_medicine.medicine.price,
-        total_price=cart_item_with_medicine.quantity * cart_item_with_medicine.medicine.price,
+        id=cart_item.id,
+        cart_id=cart_item.cart_id,
+        medicine_id=cart_item.medicine_id,
+        quantity=cart_item.quantity,
+        prescription_id=cart_item.prescription_id,
+        notes=cart_item.notes,
+        unit_price=medicine.price,
+        total_price=cart_item.quantity * medicine.price,
         medicine={
-            "id": cart_item_with_medicine.medicine.id,
-            "name": cart_item_with_medicine.medicine.name,
-            "generic_name": cart_item_with_medicine.medicine.generic_name,
-            "manufacturer": cart_item_with_medicine.medicine.manufacturer,
-            "price": cart_item_with_medicine.medicine.price,
-            "prescription_required": cart_item_with_medicine.medicine.prescription_required,
-            "stock_quantity": cart_item_with_medicine.medicine.stock_quantity
+            "id": medicine.id,
+            "name": medicine.name,
+            "generic_name": medicine.generic_name,
+            "manufacturer": medicine.manufacturer,
+            "price": medicine.price,
+            "prescription_required": medicine.prescription_required,
+            "stock_quantity": medicine.stock_quantity
         },
         is_prescription_valid=True,  # TODO: Implement proper validation
-        created_at=cart_item_with_medicine.created_at,
-        updated_at=cart_item_with_medicine.updated_at
+        created_at=cart_item.created_at,
+        updated_at=cart_item.updated_at
     )
 
 
 @router.put("/items/{item_id}", response_model=CartItemResponse)
-def update_cart_item(
-    item_id: str,
+async def update_cart_item(
+    item_id: UUIDPath,
     item_data: UpdateCartItemRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> CartItemResponse:
     """
     Update a cart item
     """
-    # Get user's cart
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
-    if not cart:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Cart not found"
+    # Ownership, existence and stock are checked by the UPDATE itself
+    values = {"quantity": item_data.quantity}
+    if item_data.prescription_id:
+        values["prescription_id"] = item_data.prescription_id
+    result = await db.execute(
+        update(CartItem)
+        .where(
+            CartItem.id == item_id,
+            CartItem.cart_id == select(Cart.id).where(Cart.user_id == current_user.id).scalar_subquery(),
+            exists().where(
+                Medicine.id == CartItem.medicine_id,
+                Medicine.stock_quantity >= item_data.quantity
+            )
         )
-    
-    # Get cart item
-    cart_item = db.query(CartItem).options(joinedload(CartItem.medicine)).filter(
-        CartItem.id == item_id,
-        CartItem.cart_id == cart.id
-    ).first()
+        .values(**values)
+        .returning(CartItem)
+        .execution_options(synchronize_session=False)
+    )
+    cart_item = result.scalar_one_or_none()
     
     if not cart_item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Cart item not found"
+        # Nothing updated: tell a missing item apart from too little stock
+        result = await db.execute(
+            select(Medicine.stock_quantity)
+            .join(CartItem, CartItem.medicine_id == Medicine.id)
+            .where(
+                CartItem.id == item_id,
+                CartItem.cart_id == select(Cart.id).where(Cart.user_id == current_user.id).scalar_subquery()
+            )
         )
-    
-    # Check stock availability
-    if cart_item.medicine.stock_quantity < item_data.quantity:
+        available = result.scalar_one_or_none()
+        if available is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cart item not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Insufficient stock. Available: {cart_item.medicine.stock_quantity}"
+            detail=f"Insufficient stock. Available: {available}"
         )
     
-    # Update cart item
-    cart_item.quantity = item_data.quantity
-    if item_data.prescription_id:
-        cart_item.prescription_id = item_data.prescription_id
+    medicine = await db.get(Medicine, cart_item.medicine_id)
+    await db.commit()
+    # notes is not a cart_items column; it is only echoed back
     if item_data.notes:
         cart_item.notes = item_data.notes
     
-    db.commit()
-    db.refresh(cart_item)
-    
     return CartItemResponse(
         id=cart_item.id,
         cart_id=cart_item.cart_id,
@@ -262,16 +301,16 @@ def update_cart_item(
         quantity=cart_item.quantity,
         prescription_id=cart_item.prescription_id,
         notes=cart_item.notes,
-        unit_price=cart_item.medicine.price,
-        total_price=cart_item.quantity * cart_item.medicine.price,
+        unit_price=medicine.price,
+        total_price=cart_item.quantity * medicine.price,
         medicine={
-            "id": cart_item.medicine.id,
-            "name": cart_item.medicine.name,
-            "generic_name": cart_item.medicine.generic_name,
-            "manufacturer": cart_item.medicine.manufacturer,
-            "price": cart_item.medicine.price,
-            "prescription_required": cart_item.medicine.prescription_required,
-            "stock_quantity": cart_item.medicine.stock_quantity
+            "id": medicine.id,
+            "name": medicine.name,
+            "generic_name": medicine.generic_name,
+            "manufacturer": medicine.manufacturer,
+            "price": medicine.price,
+            "prescription_required": medicine.prescription_required,
+            "stock_quantity": medicine.stock_quantity
         },
         is_prescription_valid=True,  # TODO: Implement proper validation
         created_at=cart_item.created_at,
@@ -280,16 +319,17 @@ def update_cart_item(
 
 
 @router.delete("/items/{item_id}")
-def remove_from_cart(
-    item_id: str,
-    db: Session = Depends(get_db),
+async def remove_from_cart(
+    item_id: UUIDPath,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> Dict[str, str]:
     """
     Remove an item from the cart
     """
     # Get user's cart
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
+    result = await db.execute(select(Cart).where(Cart.user_id == current_user.id))
+    cart = result.scalar_one_or_none()
     if not cart:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -297,10 +337,13 @@ def remove_from_cart(
         )
     
     # Get and delete cart item
-    cart_item = db.query(CartItem).filter(
-        CartItem.id == item_id,
-        CartItem.cart_id == cart.id
-    ).first()
+    result = await db.execute(
+        select(CartItem).where(
+            CartItem.id == item_id,
+            CartItem.cart_id == cart.id
+        )
+    )
+    cart_item = result.scalar_one_or_none()
     
     if not cart_item:
         raise HTTPException(
@@ -308,62 +351,62 @@ def remove_from_cart(
             detail="Cart item not found"
         )
     
-    db.delete(cart_item)
-    db.commit()
+    await db.delete(cart_item)
+    await db.commit()
     
     return {"message": "Item removed from cart successfully"}
 
 
 @router.delete("/clear")
-def clear_cart(
-    db: Session = Depends(get_db),
+async def clear_cart(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
-) -> Dict[str, str]:
+) -> Dict[str, Any]:
     """
     Clear all items from the cart
     """
-    # Get user's cart
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
-    if not cart:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Cart not found"
+    # Delete all cart items in one statement (cart resolved by subquery)
+    result = await db.execute(
+        delete(CartItem)
+        .where(
+            CartItem.cart_id == select(Cart.id).where(Cart.user_id == current_user.id).scalar_subquery()
         )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
     
-    # Delete all cart items
-    db.query(CartItem).filter(CartItem.cart_id == cart.id).delete()
-    db.commit()
-    
-    return {"message": "Cart cleared successfully"}
+    return {"message": "Cart cleared successfully", "items_removed": result.rowcount}
 
 
 @router.get("/summary", response_model=CartSummary)
-def get_cart_summary(
-    db: Session = Depends(get_db),
+async def get_cart_summary(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> CartSummary:
     """
     Get cart summary with totals
     """
-    cart_service = CartService(db)
-    cart = cart_service.get_or_create_cart(current_user.id)
-    
-    # Get cart items
-    cart_items = db.query(CartItem).options(joinedload(CartItem.medicine)).filter(
-        CartItem.cart_id == cart.id
-    ).all()
+    # Totals are kept on the cart row by database triggers
+    result = await db.execute(
+        select(Cart.item_count, Cart.subtotal, Cart.has_prescription_items)
+        .where(Cart.user_id == current_user.id)
+    )
+    totals = result.first()
+    if totals is None:
+        cart_service = CartService(db)
+        await cart_service.get_or_create_cart(current_user.id)
+        item_count, subtotal, has_prescription_items = 0, 0.0, False
+    else:
+        item_count, has_prescription_items = totals.item_count, totals.has_prescription_items
+        subtotal = float(totals.subtotal)
     
     # Calculate totals
-    subtotal = sum(item.quantity * item.medicine.price for item in cart_items)
     tax_amount = subtotal * 0.18  # 18% GST
     delivery_fee = 50.0 if subtotal < 500 else 0.0  # Free delivery above ₹500
     total_amount = subtotal + tax_amount + delivery_fee
     
-    # Check for prescription items
-    has_prescription_items = any(item.medicine.prescription_required for item in cart_items)
-    
-    return CartSummary(
-        total_items=len(cart_items),
+    return CartSummary.model_construct(
+        total_items=item_count,
         subtotal=subtotal,
         tax_amount=tax_amount,
         delivery_fee=delivery_fee,
@@ -374,12 +417,12 @@ def get_cart_summary(
 
 
 @router.post("/validate", response_model=CartValidationResult)
-def validate_cart(
-    db: Session = Depends(get_db),
+async def validate_cart(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> CartValidationResult:
     """
     Validate cart items for checkout
     """
     cart_service = CartService(db)
-    return cart_service.validate_cart(current_user.id)
+    return await cart_service.validate_cart(current_user.id)
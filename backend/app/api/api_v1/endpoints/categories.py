@@ -2,92 +2,147 @@
 Category management endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List
 from app.database.session import get_db
 from app.models.category import Category
 from app.models.medicine import Medicine
+from app.schemas.common import UUIDPath
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryWithMedicineCount
 from app.api.api_v1.endpoints.auth import get_current_user
+from app.core.cache import cache_delete_prefix, cache_get, cache_set
+from app.core.responses import DefaultResponse
 from app.models.user import User
 
 router = APIRouter()
 
+# Category listings change rarely and every category or medicine write drops
+# them, so they are kept for a while
+CATEGORY_CACHE_PREFIX = "categories:"
+CATEGORY_CACHE_TTL = 600
+
+# Dump whole category lists in one pydantic-core call
+_CATEGORY_LIST_ADAPTER = TypeAdapter(List[CategoryResponse])
+_CATEGORY_COUNT_LIST_ADAPTER = TypeAdapter(List[CategoryWithMedicineCount])
+
+
+def _build_category_response(category: Category) -> CategoryResponse:
+    """Build a category response from a loaded row without re-validating it"""
+    return CategoryResponse.model_construct(
+        id=category.id,
+        name=category.name,
+        description=category.description,
+        parent_category_id=category.parent_category_id,
+        created_at=category.created_at,
+        updated_at=category.updated_at,
+        subcategories=[_build_category_response(sub) for sub in category.subcategories],
+    )
+
 
 @router.get("/", response_model=List[CategoryResponse])
-def get_categories(
+async def get_categories(
     include_subcategories: bool = True,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> List[CategoryResponse]:
     """
     Get all categories with optional subcategories
     """
+    cache_key = f"{CATEGORY_CACHE_PREFIX}tree:{str(include_subcategories).lower()}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     if include_subcategories:
-        # Get root categories (no parent)
-        categories = db.query(Category).filter(Category.parent_category_id.is_(None)).all()
-        
-        # Load subcategories for each root category
-        for category in categories:
-            category.subcategories = db.query(Category).filter(
-                Category.parent_category_id == category.id
-            ).all()
+        # Get root categories (no parent) with their subcategories in one extra query
+        result = await db.execute(
+            select(Category)
+            .where(Category.parent_category_id.is_(None))
+            .options(selectinload(Category.subcategories))
+        )
+        categories = result.scalars().all()
     else:
-        categories = db.query(Category).all()
+        result = await db.execute(select(Category))
+        categories = result.scalars().all()
     
-    return [CategoryResponse.model_validate(cat) for cat in categories]
+    response = DefaultResponse(
+        content=_CATEGORY_LIST_ADAPTER.dump_python(
+            [_build_category_response(cat) for cat in categories], mode="json"
+        )
+    )
+    await cache_set(cache_key, response.body, CATEGORY_CACHE_TTL)
+    return response
 
 
 @router.get("/with-counts", response_model=List[CategoryWithMedicineCount])
-def get_categories_with_medicine_counts(
-    db: Session = Depends(get_db)
+async def get_categories_with_medicine_counts(
+    db: AsyncSession = Depends(get_db)
 ) -> List[CategoryWithMedicineCount]:
     """
     Get all categories with medicine counts
     """
-    # Query categories with medicine counts
-    categories_with_counts = db.query(
-        Category,
-        func.count(Medicine.id).label('medicine_count')
-    ).outerjoin(Medicine).group_by(Category.id).all()
-    
-    result = []
-    for category, count in categories_with_counts:
-        category_dict = CategoryResponse.model_validate(category).model_dump()
-        category_dict['medicine_count'] = count
-        result.append(CategoryWithMedicineCount(**category_dict))
+    cache_key = f"{CATEGORY_CACHE_PREFIX}with-counts"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Query category columns with medicine counts (empty categories count 0)
+    result = await db.execute(
+        select(
+            Category.id,
+            Category.name,
+            Category.description,
+            Category.parent_category_id,
+            Category.created_at,
+            Category.updated_at,
+            func.count(Medicine.id).label('medicine_count')
+        )
+        .select_from(Category)
+        .outerjoin(Medicine, Medicine.category_id == Category.id)
+        .group_by(Category.id)
+    )
     
-    return result
+    # Rows come straight from the database, so skip re-validation
+    response = DefaultResponse(
+        content=_CATEGORY_COUNT_LIST_ADAPTER.dump_python([
+            CategoryWithMedicineCount.model_construct(**row._asdict())
+            for row in result.all()
+        ], mode="json")
+    )
+    await cache_set(cache_key, response.body, CATEGORY_CACHE_TTL)
+    return response
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-def get_category(
-    category_id: str,
-    db: Session = Depends(get_db)
+async def get_category(
+    category_id: UUIDPath,
+    db: AsyncSession = Depends(get_db)
 ) -> CategoryResponse:
     """
     Get a specific category by ID
     """
-    category = db.query(Category).filter(Category.id == category_id).first()
+    result = await db.execute(
+        select(Category)
+        .where(Category.id == category_id)
+        .options(selectinload(Category.subcategories))
+    )
+    category = result.scalar_one_or_none()
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
     
-    # Load subcategories
-    category.subcategories = db.query(Category).filter(
-        Category.parent_category_id == category.id
-    ).all()
-    
     return CategoryResponse.model_validate(category)
 
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
-def create_category(
+async def create_category(
     category_data: CategoryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> CategoryResponse:
     """
@@ -97,7 +152,10 @@ def create_category(
     
     # Check if parent category exists
     if category_data.parent_category_id:
-        parent = db.query(Category).filter(Category.id == category_data.parent_category_id).first()
+        result = await db.execute(
+            select(Category).where(Category.id == category_data.parent_category_id)
+        )
+        parent = result.scalar_one_or_none()
         if not parent:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -105,7 +163,8 @@ def create_category(
             )
     
     # Check if category name already exists
-    existing_category = db.query(Category).filter(Category.name == category_data.name).first()
+    result = await db.execute(select(Category).where(Category.name == category_data.name))
+    existing_category = result.scalar_one_or_none()
     if existing_category:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -115,17 +174,18 @@ def create_category(
     # Create new category
     new_category = Category(**category_data.model_dump())
     db.add(new_category)
-    db.commit()
-    db.refresh(new_category)
+    await db.commit()
+    await cache_delete_prefix(CATEGORY_CACHE_PREFIX)
+    await db.refresh(new_category)
     
     return CategoryResponse.model_validate(new_category)
 
 
 @router.put("/{category_id}", response_model=CategoryResponse)
-def update_category(
-    category_id: str,
+async def update_category(
+    category_id: UUIDPath,
     category_data: CategoryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> CategoryResponse:
     """
@@ -133,7 +193,8 @@ def update_category(
     """
     # TODO: Add role-based access control for admin users
     
-    category = db.query(Category).filter(Category.id == category_id).first()
+    result = await db.execute(select(Category).where(Category.id == category_id))
+    category = result.scalar_one_or_none()
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -145,16 +206,17 @@ def update_category(
     for field, value in update_data.items():
         setattr(category, field, value)
     
-    db.commit()
-    db.refresh(category)
+    await db.commit()
+    await cache_delete_prefix(CATEGORY_CACHE_PREFIX)
+    await db.refresh(category)
     
     return CategoryResponse.model_validate(category)
 
 
 @router.delete("/{category_id}")
-def delete_category(
-    category_id: str,
-    db: Session = Depends(get_db),
+async def delete_category(
+    category_id: UUIDPath,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> dict:
     """
@@ -162,30 +224,43 @@ def delete_category(
     """
     # TODO: Add role-based access control for admin users
     
-    category = db.query(Category).filter(Category.id == category_id).first()
+    result = await db.execute(select(Category).where(Category.id == category_id))
+    category = result.scalar_one_or_none()
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
     
-    # Check if category has medicines
-    medicine_count = db.query(Medicine).filter(Medicine.category_id == category_id).count()
-    if medicine_count > 0:
+    # Check if category has medicines (EXISTS stops at the first match;
+    # the exact count is only needed for the error message)
+    has_medicines = await db.scalar(
+        select(exists().where(Medicine.category_id == category_id))
+    )
+    if has_medicines:
+        medicine_count = await db.scalar(
+            select(func.count()).select_from(Medicine).where(Medicine.category_id == category_id)
+        )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot delete category with {medicine_count} medicines. Move medicines to another category first."
         )
     
     # Check if category has subcategories
-    subcategory_count = db.query(Category).filter(Category.parent_category_id == category_id).count()
-    if subcategory_count > 0:
+    has_subcategories = await db.scalar(
+        select(exists().where(Category.parent_category_id == category_id))
+    )
+    if has_subcategories:
+        subcategory_count = await db.scalar(
+            select(func.count()).select_from(Category).where(Category.parent_category_id == category_id)
+        )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot delete category with {subcategory_count} subcategories. Delete subcategories first."
         )
     
-    db.delete(category)
-    db.commit()
+    await db.delete(category)
+    await db.commit()
+    await cache_delete_prefix(CATEGORY_CACHE_PREFIX)
     
     return {"message": "Category deleted successfully"}
@@ -2,178 +2,348 @@
 Medicine management endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_, func
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload, undefer_group
+from sqlalchemy import String, or_, and_, bindparam, func, literal_column, select, tuple_, type_coerce, update
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from pydantic import TypeAdapter
+from typing import List, Literal, Optional
+from datetime import datetime
+import hashlib
+import json
 import math
 from app.database.session import get_db
 from app.models.medicine import Medicine
 from app.models.category import Category
+from app.schemas.common import UUIDPath, UUIDStr
 from app.schemas.medicine import (
     MedicineCreate, MedicineUpdate, MedicineResponse, 
     MedicineSearchQuery, MedicineSearchResponse, MedicineAlternatives
 )
 from app.api.api_v1.endpoints.auth import get_current_user
+from app.api.api_v1.endpoints.categories import CATEGORY_CACHE_PREFIX
+from app.core.cache import cache_delete_prefix, cache_get, cache_set
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.responses import DefaultResponse, conditional_json_response
 from app.models.user import User
 
 router = APIRouter()
 
+# Medicine reads are cached briefly and dropped on any medicine write
+MEDICINE_CACHE_PREFIX = "medicines:"
+MEDICINE_CACHE_TTL = 60
+# Single-medicine entries only go stale through writes that already drop them
+# (medicine edits, stock updates, orders), so the TTL is just a backstop
+MEDICINE_DETAIL_CACHE_TTL = 600
+# Browsers and CDNs may reuse medicine reads for this long, revalidating by ETag
+MEDICINE_HTTP_MAX_AGE = 30
+
+# Statements for the hot read paths, built once so the compiled form is reused
+# MedicineResponse includes the deferred "details" columns
+_WITH_DETAILS = undefer_group("details")
+
+_GET_MEDICINE_STMT = (
+    select(Medicine)
+    .options(joinedload(Medicine.category), _WITH_DETAILS)
+    .where(Medicine.id == bindparam("medicine_id"))
+)
+_LIST_MEDICINES_STMT = (
+    select(Medicine)
+    .options(joinedload(Medicine.category), _WITH_DETAILS)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+# Generated full-text document (PostgreSQL only, see migration f3a9c7d2b810);
+# not mapped on the model so SQLite deployments keep working
+_MEDICINE_SEARCH_DOC = literal_column("medicines.search_doc", type_=TSVECTOR)
+
+# Validate and dump whole result lists in one pydantic-core call
+_MEDICINE_LIST_ADAPTER = TypeAdapter(List[MedicineResponse])
+
+# Sort clauses for search_medicines, keyed by the sort_by parameter
+_SORT_COLUMNS = {
+    "name": Medicine.name,
+    "price": Medicine.price,
+    "created_at": Medicine.created_at,
+}
+_SORT_COLUMNS_ASC = {key: (column.asc(), Medicine.id.asc()) for key, column in _SORT_COLUMNS.items()}
+_SORT_COLUMNS_DESC = {key: (column.desc(), Medicine.id.desc()) for key, column in _SORT_COLUMNS.items()}
+
+# Turn a sort value read back from a cursor into the column's Python type
+_SORT_VALUE_PARSERS = {
+    "name": str,
+    "price": float,
+    "created_at": datetime.fromisoformat,
+}
+
+# Queries shorter than this can't use the pg_trgm GIN indexes
+MIN_TRIGRAM_QUERY_LENGTH = 3
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def _invalidate_medicine_caches() -> None:
+    """Drop cached medicine reads and category counts after a medicine write"""
+    await cache_delete_prefix(MEDICINE_CACHE_PREFIX)
+    await cache_delete_prefix(CATEGORY_CACHE_PREFIX)
+
 
 @router.get("/search", response_model=MedicineSearchResponse)
-def search_medicines(
+async def search_medicines(
+    request: Request,
     q: Optional[str] = Query(None, description="Search query for medicine name or generic name"),
-    category_id: Optional[str] = Query(None, description="Filter by category ID"),
+    category_id: Optional[UUIDStr] = Query(None, description="Filter by category ID"),
     prescription_required: Optional[bool] = Query(None, description="Filter by prescription requirement"),
     min_price: Optional[float] = Query(None, ge=0, description="Minimum price filter"),
     max_price: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
     in_stock: Optional[bool] = Query(None, description="Filter medicines in stock"),
     manufacturer: Optional[str] = Query(None, description="Filter by manufacturer"),
     dosage_form: Optional[str] = Query(None, description="Filter by dosage form"),
-    sort_by: str = Query("name", description="Sort by: name, price, created_at"),
-    sort_order: str = Query("asc", description="Sort order: asc, desc"),
+    sort_by: Literal["name", "price", "created_at"] = Query("name", description="Sort by: name, price, created_at"),
+    sort_order: Literal["asc", "desc"] = Query("asc", description="Sort order: asc, desc"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces page"),
+    db: AsyncSession = Depends(get_db)
 ) -> MedicineSearchResponse:
     """
     Search medicines with advanced filtering and pagination
     """
-    # Build query
-    query = db.query(Medicine).options(joinedload(Medicine.category))
+    params = {
+        "q": q, "category_id": category_id, "prescription_required": prescription_required,
+        "min_price": min_price, "max_price": max_price, "in_stock": in_stock,
+        "manufacturer": manufacturer, "dosage_form": dosage_form, "sort_by": sort_by,
+        "sort_order": sort_order, "page": page, "page_size": page_size, "cursor": cursor,
+    }
+    params_digest = hashlib.blake2b(json.dumps(params, sort_keys=True).encode(), digest_size=16).hexdigest()
+    cache_key = f"{MEDICINE_CACHE_PREFIX}search:{params_digest}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return conditional_json_response(request, cached, MEDICINE_HTTP_MAX_AGE)
+    
+    # Build filters
+    filters = []
+    rank = None
     
-    # Apply filters
     if q:
-        search_filter = or_(
-            Medicine.name.ilike(f"%{q}%"),
-            Medicine.generic_name.ilike(f"%{q}%")
-        )
-        query = query.filter(search_filter)
+        if len(q) < MIN_TRIGRAM_QUERY_LENGTH:
+            # Too short for trigram matching: prefix match on the name, served
+            # by the lower(name) text_pattern_ops index
+            filters.append(func.lower(Medicine.name).like(f"{_escape_like(q.lower())}%", escape="\\"))
+        elif len(q.split()) > 1 and db.bind.dialect.name == "postgresql":
+            # Multi-word query: stemmed full-text match through the GIN index
+            ts_query = func.plainto_tsquery("english", q)
+            filters.append(_MEDICINE_SEARCH_DOC.op("@@")(ts_query))
+            rank = func.ts_rank_cd(_MEDICINE_SEARCH_DOC, ts_query)
+        else:
+            filters.append(or_(
+                Medicine.name.ilike(f"%{q}%"),
+                Medicine.generic_name.ilike(f"%{q}%")
+            ))
+            if db.bind.dialect.name == "postgresql":
+                # Closest trigram match first, on whichever name matched
+                rank = func.greatest(
+                    func.word_similarity(q, Medicine.name),
+                    func.word_similarity(q, Medicine.generic_name)
+                )
     
     if category_id:
-        query = query.filter(Medicine.category_id == category_id)
+        filters.append(Medicine.category_id == category_id)
     
     if prescription_required is not None:
-        query = query.filter(Medicine.prescription_required == prescription_required)
+        filters.append(Medicine.prescription_required == prescription_required)
     
     if min_price is not None:
-        query = query.filter(Medicine.price >= min_price)
+        filters.append(Medicine.price >= min_price)
     
     if max_price is not None:
-        query = query.filter(Medicine.price <= max_price)
+        filters.append(Medicine.price <= max_price)
     
     if in_stock:
-        query = query.filter(Medicine.stock_quantity > 0)
+        filters.append(Medicine.stock_quantity > 0)
     
     if manufacturer:
-        query = query.filter(Medicine.manufacturer.ilike(f"%{manufacturer}%"))
+        filters.append(Medicine.manufacturer.ilike(f"%{manufacturer}%"))
     
     if dosage_form:
-        query = query.filter(Medicine.dosage_form.ilike(f"%{dosage_form}%"))
-    
-    # Apply sorting
-    if sort_by == "name":
-        sort_column = Medicine.name
-    elif sort_by == "price":
-        sort_column = Medicine.price
-    elif sort_by == "created_at":
-        sort_column = Medicine.created_at
+        filters.append(Medicine.dosage_form.ilike(f"%{dosage_form}%"))
+    
+    # Apply sorting (id breaks ties so the order is stable across pages)
+    order_by = (_SORT_COLUMNS_DESC if sort_order == "desc" else _SORT_COLUMNS_ASC)[sort_by]
+    sort_column = _SORT_COLUMNS[sort_by]
+    # Text searches are ranked by relevance first; keyset cursors can't
+    # seek on the rank, so those pages are paged by number only
+    ranked = rank is not None and not cursor
+    if ranked:
+        order_by = (rank.desc(), *order_by)
+    
+    if cursor:
+        # Keyset pagination: seek past the last row of the previous page
+        sort_value, last_id = decode_cursor(cursor, 2)
+        try:
+            sort_value = _SORT_VALUE_PARSERS[sort_by](sort_value)
+        except (TypeError, ValueError, ArithmeticError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        if sort_by == "created_at" and db.bind.dialect.name == "sqlite":
+            # SQLite keeps CURRENT_TIMESTAMP defaults as text without
+            # microseconds; compare in that same text form
+            sort_column = type_coerce(sort_column, String)
+            sort_value = str(sort_value)
+        key = tuple_(sort_column, Medicine.id)
+        seek = key < (sort_value, last_id) if sort_order == "desc" else key > (sort_value, last_id)
+        offset = 0
+        # The window count would only see rows after the cursor
+        stmt = select(
+            Medicine,
+            select(func.count(Medicine.id)).where(*filters).scalar_subquery().label("total")
+        ).where(*filters, seek)
     else:
-        sort_column = Medicine.name
-    
-    if sort_order == "desc":
-        query = query.order_by(sort_column.desc())
+        offset = (page - 1) * page_size
+        # Fetch the page and the total match count in one query
+        stmt = select(Medicine, func.count().over().label("total")).where(*filters)
+    
+    result = await db.execute(
+        stmt
+        .options(joinedload(Medicine.category), _WITH_DETAILS)
+        .order_by(*order_by)
+        .offset(offset)
+        .limit(page_size)
+    )
+    rows = result.all()
+    medicines = [row.Medicine for row in rows]
+    
+    if rows:
+        total = rows[0].total
+    elif offset or cursor:
+        # Past the last page: no rows to carry the total
+        result = await db.execute(select(func.count(Medicine.id)).where(*filters))
+        total = result.scalar_one()
     else:
-        query = query.order_by(sort_column.asc())
-    
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * page_size
-    medicines = query.offset(offset).limit(page_size).all()
+        total = 0
     
     # Calculate total pages
     total_pages = math.ceil(total / page_size)
     
-    return MedicineSearchResponse(
-        medicines=[MedicineResponse.model_validate(med) for med in medicines],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
+    next_cursor = None
+    if len(medicines) == page_size and not ranked:
+        last = medicines[-1]
+        next_cursor = encode_cursor(getattr(last, sort_by), last.id)
+    
+    response = DefaultResponse(
+        content=MedicineSearchResponse.model_construct(
+            medicines=_MEDICINE_LIST_ADAPTER.validate_python(medicines, from_attributes=True),
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=total_pages,
+            next_cursor=next_cursor
+        ).model_dump(mode="json")
     )
+    await cache_set(cache_key, response.body, MEDICINE_CACHE_TTL)
+    return conditional_json_response(request, response.body, MEDICINE_HTTP_MAX_AGE)
 
 
 @router.get("/", response_model=List[MedicineResponse])
-def get_medicines(
+async def get_medicines(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> List[MedicineResponse]:
     """
     Get all medicines with pagination
     """
-    medicines = db.query(Medicine).options(joinedload(Medicine.category)).offset(skip).limit(limit).all()
-    return [MedicineResponse.model_validate(med) for med in medicines]
+    result = await db.execute(_LIST_MEDICINES_STMT, {"skip": skip, "limit": limit})
+    medicines = result.scalars().all()
+    medicines = _MEDICINE_LIST_ADAPTER.validate_python(medicines, from_attributes=True)
+    response = DefaultResponse(content=_MEDICINE_LIST_ADAPTER.dump_python(medicines, mode="json"))
+    return conditional_json_response(request, response.body, MEDICINE_HTTP_MAX_AGE)
 
 
 @router.get("/{medicine_id}", response_model=MedicineResponse)
-def get_medicine(
-    medicine_id: str,
-    db: Session = Depends(get_db)
+async def get_medicine(
+    medicine_id: UUIDPath,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ) -> MedicineResponse:
     """
     Get a specific medicine by ID
     """
-    medicine = db.query(Medicine).options(joinedload(Medicine.category)).filter(Medicine.id == medicine_id).first()
+    cache_key = f"{MEDICINE_CACHE_PREFIX}id:{medicine_id}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return conditional_json_response(request, cached, MEDICINE_HTTP_MAX_AGE)
+    
+    result = await db.execute(_GET_MEDICINE_STMT, {"medicine_id": medicine_id})
+    medicine = result.scalar_one_or_none()
     if not medicine:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Medicine not found"
         )
     
-    return MedicineResponse.model_validate(medicine)
+    response = DefaultResponse(content=MedicineResponse.model_validate(medicine).model_dump(mode="json"))
+    await cache_set(cache_key, response.body, MEDICINE_DETAIL_CACHE_TTL)
+    return conditional_json_response(request, response.body, MEDICINE_HTTP_MAX_AGE)
 
 
 @router.get("/{medicine_id}/alternatives", response_model=MedicineAlternatives)
-def get_medicine_alternatives(
-    medicine_id: str,
-    db: Session = Depends(get_db)
+async def get_medicine_alternatives(
+    medicine_id: UUIDPath,
+    db: AsyncSession = Depends(get_db)
 ) -> MedicineAlternatives:
     """
     Get alternative medicines for a specific medicine
     """
-    medicine = db.query(Medicine).filter(Medicine.id == medicine_id).first()
-    if not medicine:
+    # Find alternatives based on generic name or category in one round trip:
+    # the target row is outer-joined to its alternatives, so no rows at all
+    # means the medicine doesn't exist and a NULL alternative means it has none
+    target = aliased(Medicine)
+    result = await db.execute(
+        select(target.id, Medicine)
+        .select_from(target)
+        .outerjoin(
+            Medicine,
+            and_(
+                Medicine.id != target.id,
+                or_(
+                    Medicine.generic_name == target.generic_name,
+                    Medicine.category_id == target.category_id
+                )
+            )
+        )
+        .where(target.id == medicine_id)
+        .options(_WITH_DETAILS)
+        .limit(10)
+    )
+    rows = result.all()
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Medicine not found"
         )
+    alternatives = [row.Medicine for row in rows if row.Medicine is not None]
     
-    # Find alternatives based on generic name or category
-    alternatives_query = db.query(Medicine).filter(
-        and_(
-            Medicine.id != medicine_id,
-            or_(
-                Medicine.generic_name == medicine.generic_name,
-                Medicine.category_id == medicine.category_id
-            )
-        )
-    ).limit(10)
-    
-    alternatives = alternatives_query.all()
-    
-    return MedicineAlternatives(
-        medicine_id=medicine_id,
-        alternatives=[MedicineResponse.model_validate(alt) for alt in alternatives]
+    return DefaultResponse(
+        content=MedicineAlternatives(
+            medicine_id=medicine_id,
+            alternatives=_MEDICINE_LIST_ADAPTER.validate_python(alternatives, from_attributes=True)
+        ).model_dump(mode="json")
     )
 
 
 @router.post("/", response_model=MedicineResponse, status_code=status.HTTP_201_CREATED)
-def create_medicine(
+async def create_medicine(
     medicine_data: MedicineCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> MedicineResponse:
     """
@@ -183,7 +353,8 @@ def create_medicine(
     
     # Check if category exists
     if medicine_data.category_id:
-        category = db.query(Category).filter(Category.id == medicine_data.category_id).first()
+        result = await db.execute(select(Category).where(Category.id == medicine_data.category_id))
+        category = result.scalar_one_or_none()
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -193,20 +364,21 @@ def create_medicine(
     # Create new medicine
     new_medicine = Medicine(**medicine_data.model_dump())
     db.add(new_medicine)
-    db.commit()
-    db.refresh(new_medicine)
+    await db.commit()
+    await _invalidate_medicine_caches()
     
-    # Load category for response
-    medicine_with_category = db.query(Medicine).options(joinedload(Medicine.category)).filter(Medicine.id == new_medicine.id).first()
-    
-    return MedicineResponse.model_validate(medicine_with_category)
+    # Server defaults come back with the INSERT (RETURNING), no reload needed
+    return DefaultResponse(
+        content=MedicineResponse.model_validate(new_medicine).model_dump(mode="json"),
+        status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.put("/{medicine_id}", response_model=MedicineResponse)
-def update_medicine(
-    medicine_id: str,
+async def update_medicine(
+    medicine_id: UUIDPath,
     medicine_data: MedicineUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> MedicineResponse:
     """
@@ -214,7 +386,10 @@ def update_medicine(
     """
     # TODO: Add role-based access control for admin users
     
-    medicine = db.query(Medicine).filter(Medicine.id == medicine_id).first()
+    result = await db.execute(
+        select(Medicine).options(_WITH_DETAILS).where(Medicine.id == medicine_id)
+    )
+    medicine = result.scalar_one_or_none()
     if not medicine:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -226,20 +401,18 @@ def update_medicine(
     for field, value in update_data.items():
         setattr(medicine, field, value)
     
-    db.commit()
-    db.refresh(medicine)
-    
-    # Load category for response
-    medicine_with_category = db.query(Medicine).options(joinedload(Medicine.category)).filter(Medicine.id == medicine.id).first()
+    await db.commit()
+    await _invalidate_medicine_caches()
     
-    return MedicineResponse.model_validate(medicine_with_category)
+    # updated_at comes back with the UPDATE (eager_defaults), no reload needed
+    return DefaultResponse(content=MedicineResponse.model_validate(medicine).model_dump(mode="json"))
 
 
 @router.patch("/{medicine_id}/stock")
-def update_medicine_stock(
-    medicine_id: str,
+async def update_medicine_stock(
+    medicine_id: UUIDPath,
     stock_quantity: int = Query(..., ge=0),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> dict:
     """
@@ -247,15 +420,20 @@ def update_medicine_stock(
     """
     # TODO: Add role-based access control for admin users
     
-    medicine = db.query(Medicine).filter(Medicine.id == medicine_id).first()
-    if not medicine:
+    result = await db.execute(
+        update(Medicine)
+        .where(Medicine.id == medicine_id)
+        .values(stock_quantity=stock_quantity)
+        .returning(Medicine.id)
+    )
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Medicine not found"
         )
     
-    medicine.stock_quantity = stock_quantity
-    db.commit()
+    await db.commit()
+    await _invalidate_medicine_caches()
     
     return {
         "message": "Stock updated successfully",
@@ -265,9 +443,9 @@ def update_medicine_stock(
 
 
 @router.delete("/{medicine_id}")
-def delete_medicine(
-    medicine_id: str,
-    db: Session = Depends(get_db),
+async def delete_medicine(
+    medicine_id: UUIDPath,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> dict:
     """
@@ -275,14 +453,16 @@ def delete_medicine(
     """
     # TODO: Add role-based access control for admin users
     
-    medicine = db.query(Medicine).filter(Medicine.id == medicine_id).first()
+    result = await db.execute(select(Medicine).where(Medicine.id == medicine_id))
+    medicine = result.scalar_one_or_none()
     if not medicine:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Medicine not found"
         )
     
-    db.delete(medicine)
-    db.commit()
+    await db.delete(medicine)
+    await db.commit()
+    await _invalidate_medicine_caches()
     
     return {"message": "Medicine deleted successfully"}
@@ -2,57 +2,122 @@
 Order management endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func, desc
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, and_, bindparam, func, desc, select, text, tuple_, type_coerce
+from pydantic import TypeAdapter
 from typing import List, Optional, Dict, Any
 import math
 from datetime import date, datetime, timedelta
+from types import MappingProxyType
 from app.database.session import get_db
 from app.models.order import Order, OrderItem
 from app.models.cart import Cart, CartItem
 from app.models.medicine import Medicine
 from app.models.user import User
+from app.models.delivery import DeliveryPartner, Pharmacy  # noqa: F401 - Order relationships resolve against these
+from app.schemas.common import UUIDPath, UUIDStr
 from app.schemas.order import (
     OrderCreate, OrderUpdate, OrderResponse, OrderSearchQuery, OrderSearchResponse,
     OrderStatusUpdate, OrderTrackingInfo, OrderStats, CreateOrderFromCart,
-    OrderCancellation, OrderDeliveryUpdate, OrderStatus, PaymentStatus
+    OrderCancellation, OrderDeliveryUpdate, OrderStatus, OrderStatusValue, PaymentStatus,
+    PaymentStatusValue
 )
 from app.api.api_v1.endpoints.auth import get_current_user
-from app.services.order_service import OrderService
+from app.api.api_v1.endpoints.medicines import MEDICINE_CACHE_PREFIX
+from app.core.cache import cache_delete, cache_delete_prefix, cache_get, cache_set
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.responses import DefaultResponse
+from app.services.order_service import ORDER_ITEMS_OPTIONS, OrderService
 from app.services.cart_service import CartService
+from app.services.order_stats import order_stats_query
 
 router = APIRouter()
 
+# Statements for the hot read paths, built once so the compiled form is reused
+_GET_ORDER_STMT = (
+    select(Order)
+    .options(*ORDER_ITEMS_OPTIONS)
+    .where(Order.id == bindparam("order_id"))
+)
+_USER_ORDERS_STMT = (
+    select(Order)
+    .options(*ORDER_ITEMS_OPTIONS)
+    .where(Order.user_id == bindparam("user_id"))
+    .order_by(desc(Order.created_at), desc(Order.id))
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+# Admin dashboards poll the stats endpoint; a short TTL absorbs the polling
+ORDER_STATS_CACHE_KEY = "orders:stats:overview"
+ORDER_STATS_CACHE_TTL = 30
+
+# Unfiltered admin searches report the planner's row estimate instead of
+# counting the whole table, once the table is big enough for it to matter
+_ORDERS_ROW_ESTIMATE_STMT = text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'orders'::regclass")
+ESTIMATED_TOTAL_THRESHOLD = 10000
+
+# Validate and dump whole result lists in one pydantic-core call
+_ORDER_LIST_ADAPTER = TypeAdapter(List[OrderResponse])
+
+# Mock tracking timeline: (status, offset from order creation, description)
+_HISTORY_TEMPLATE = (
+    ("pending", timedelta(0), "Order placed successfully"),
+    ("confirmed", timedelta(minutes=5), "Order confirmed by pharmacy"),
+    ("processing", timedelta(minutes=15), "Order is being prepared"),
+    ("shipped", timedelta(minutes=30), "Order picked up by delivery partner"),
+)
+
+# How many timeline entries each order status has reached (default: 2)
+_STATUS_STAGE = MappingProxyType({
+    OrderStatus.PROCESSING: 3,
+    OrderStatus.PACKED: 3,
+    OrderStatus.SHIPPED: 4,
+    OrderStatus.OUT_FOR_DELIVERY: 4,
+    OrderStatus.DELIVERED: 4,
+})
+
+
+async def _after_order_placed() -> None:
+    """Drop caches a new order makes stale (stock levels and order stats)"""
+    await cache_delete_prefix(MEDICINE_CACHE_PREFIX)
+    await cache_delete(ORDER_STATS_CACHE_KEY)
+
 
 @router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
-def create_order(
+async def create_order(
     order_data: OrderCreate,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> OrderResponse:
     """
     Create a new order directly
     """
     order_service = OrderService(db)
-    return order_service.create_order(current_user.id, order_data)
+    order = await order_service.create_order(current_user.id, order_data)
+    
+    # Side effects run after the response is sent
+    background_tasks.add_task(_after_order_placed)
+    return order
 
 
 @router.post("/from-cart", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
-def create_order_from_cart(
+async def create_order_from_cart(
     order_data: CreateOrderFromCart,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> OrderResponse:
     """
     Create an order from current cart items
     """
-    order_service = OrderService(db)
     cart_service = CartService(db)
     
     # Validate cart if requested
     if order_data.validate_prescriptions:
-        validation_result = cart_service.validate_cart(current_user.id)
+        validation_result = await cart_service.validate_cart(current_user.id)
         if not validation_result.is_valid:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -64,10 +129,9 @@ def create_order_from_cart(
             )
     
     # Get cart items
-    cart = cart_service.get_or_create_cart(current_user.id)
-    cart_items = db.query(CartItem).options(joinedload(CartItem.medicine)).filter(
-        CartItem.cart_id == cart.id
-    ).all()
+    cart = await cart_service.get_or_create_cart(current_user.id)
+    result = await db.execute(select(CartItem).where(CartItem.cart_id == cart.id))
+    cart_items = result.scalars().all()
     
     if not cart_items:
         raise HTTPException(
@@ -75,109 +139,189 @@ def create_order_from_cart(
             detail="Cart is empty"
         )
     
-    # Create order from cart
-    order = order_service.create_order_from_cart(current_user.id, cart_items, order_data)
-    
-    # Clear cart after successful order creation
-    cart_service.clear_cart(current_user.id)
+    # Create the order, reserve stock and clear the cart in one transaction
+    order_service = OrderService(db)
+    order = await order_service.create_order_from_cart(current_user.id, cart.id, cart_items, order_data)
     
+    # Side effects run after the response is sent
+    background_tasks.add_task(_after_order_placed)
     return order
 
 
+def _seek_before(cursor: str, dialect_name: str):
+    """Keyset condition for the orders after a (created_at, id) cursor, newest first"""
+    created_at, last_id = decode_cursor(cursor, 2)
+    try:
+        created_at = datetime.fromisoformat(created_at)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    created_at_column = Order.created_at
+    if dialect_name == "sqlite":
+        # SQLite keeps CURRENT_TIMESTAMP defaults as text without
+        # microseconds; compare in that same text form
+        created_at_column = type_coerce(Order.created_at, String)
+        created_at = str(created_at)
+    return tuple_(created_at_column, Order.id) < (created_at, last_id)
+
+
 @router.get("/", response_model=List[OrderResponse])
-def get_user_orders(
+async def get_user_orders(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    status_filter: Optional[OrderStatus] = Query(None, alias="status"),
-    db: Session = Depends(get_db),
+    status_filter: Optional[OrderStatusValue] = Query(None, alias="status"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page; replaces skip"),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> List[OrderResponse]:
     """
     Get current user's orders
-    """
-    query = db.query(Order).options(joinedload(Order.items)).filter(
-        Order.user_id == current_user.id
-    )
     
+    Newest first; when a full page is returned the X-Next-Cursor header
+    holds the cursor for the next one.
+    """
+    stmt = _USER_ORDERS_STMT
     if status_filter:
-        query = query.filter(Order.status == status_filter)
+        stmt = stmt.where(Order.status == status_filter)
     
-    orders = query.order_by(desc(Order.created_at)).offset(skip).limit(limit).all()
+    if cursor:
+        # Keyset pagination: seek past the last order of the previous page
+        stmt = stmt.where(_seek_before(cursor, db.bind.dialect.name))
+        skip = 0
     
-    return [OrderResponse.model_validate(order) for order in orders]
+    result = await db.execute(
+        stmt, {"user_id": current_user.id, "skip": skip, "limit": limit}
+    )
+    orders = result.scalars().all()
+    
+    headers = None
+    if len(orders) == limit:
+        headers = {"X-Next-Cursor": encode_cursor(orders[-1].created_at, orders[-1].id)}
+    
+    orders = _ORDER_LIST_ADAPTER.validate_python(orders, from_attributes=True)
+    return DefaultResponse(content=_ORDER_LIST_ADAPTER.dump_python(orders, mode="json"), headers=headers)
 
 
 @router.get("/search", response_model=OrderSearchResponse)
-def search_orders(
-    status_filter: Optional[OrderStatus] = Query(None, alias="status"),
-    payment_status: Optional[PaymentStatus] = Query(None),
+async def search_orders(
+    status_filter: Optional[OrderStatusValue] = Query(None, alias="status"),
+    payment_status: Optional[PaymentStatusValue] = Query(None),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
-    delivery_partner_id: Optional[str] = Query(None),
-    pharmacy_id: Optional[str] = Query(None),
+    delivery_partner_id: Optional[UUIDStr] = Query(None),
+    pharmacy_id: Optional[UUIDStr] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces page"),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> OrderSearchResponse:
     """
     Search orders with advanced filtering (admin only)
+    
+    Newest first; follow next_cursor rather than page for deep pages.
     """
     # TODO: Add role-based access control for admin users
     
-    # Build query
-    query = db.query(Order).options(joinedload(Order.items))
+    # Build filters
+    filters = []
     
-    # Apply filters
     if status_filter:
-        query = query.filter(Order.status == status_filter)
+        filters.append(Order.status == status_filter)
     
     if payment_status:
-        query = query.filter(Order.payment_status == payment_status)
+        filters.append(Order.payment_status == payment_status)
     
     if date_from:
-        query = query.filter(Order.created_at >= date_from)
+        filters.append(Order.created_at >= date_from)
     
     if date_to:
-        query = query.filter(Order.created_at <= date_to + timedelta(days=1))
+        filters.append(Order.created_at <= date_to + timedelta(days=1))
     
     if delivery_partner_id:
-        query = query.filter(Order.delivery_partner_id == delivery_partner_id)
+        filters.append(Order.delivery_partner_id == delivery_partner_id)
     
     if pharmacy_id:
-        query = query.filter(Order.pharmacy_id == pharmacy_id)
-    
-    # Get total count
-    total = query.count()
+        filters.append(Order.pharmacy_id == pharmacy_id)
+    
+    page_stmt = select(Order).options(*ORDER_ITEMS_OPTIONS).where(*filters)
+    if cursor:
+        # Keyset pagination: seek past the last order of the previous page
+        page_stmt = page_stmt.where(_seek_before(cursor, db.bind.dialect.name))
+        offset = 0
+    else:
+        offset = (page - 1) * page_size
+    page_stmt = (
+        page_stmt
+        .order_by(desc(Order.created_at), desc(Order.id))
+        .offset(offset)
+        .limit(page_size)
+    )
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    orders = query.order_by(desc(Order.created_at)).offset(offset).limit(page_size).all()
+    # No filters: the planner statistics are close enough for the total
+    estimate = None
+    if not filters and db.bind.dialect.name == "postgresql":
+        estimate = await db.scalar(_ORDERS_ROW_ESTIMATE_STMT)
+        if estimate is None or estimate < ESTIMATED_TOTAL_THRESHOLD:
+            estimate = None
+    
+    if estimate is not None:
+        result = await db.execute(page_stmt)
+        orders = result.scalars().all()
+        total = estimate
+    else:
+        # Fetch the page and the total match count in one query; after a
+        # cursor the window count would only see the rows past it
+        if cursor:
+            total_column = select(func.count(Order.id)).where(*filters).scalar_subquery()
+        else:
+            total_column = func.count().over()
+        result = await db.execute(page_stmt.add_columns(total_column.label("total")))
+        rows = result.all()
+        orders = [row.Order for row in rows]
+        
+        if rows:
+            total = rows[0].total
+        elif offset or cursor:
+            # Past the last page: no rows to carry the window count
+            result = await db.execute(select(func.count(Order.id)).where(*filters))
+            total = result.scalar_one()
+        else:
+            total = 0
     
     # Calculate total pages
     total_pages = math.ceil(total / page_size)
     
-    return OrderSearchResponse(
-        orders=[OrderResponse.model_validate(order) for order in orders],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
+    next_cursor = None
+    if len(orders) == page_size:
+        next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
+    
+    return DefaultResponse(
+        content=OrderSearchResponse.model_construct(
+            orders=_ORDER_LIST_ADAPTER.validate_python(orders, from_attributes=True),
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=total_pages,
+            is_estimate=estimate is not None,
+            next_cursor=next_cursor
+        ).model_dump(mode="json")
     )
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
-def get_order(
-    order_id: str,
-    db: Session = Depends(get_db),
+async def get_order(
+    order_id: UUIDPath,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> OrderResponse:
     """
     Get a specific order by ID
     """
-    order = db.query(Order).options(joinedload(Order.items)).filter(
-        Order.id == order_id
-    ).first()
+    result = await db.execute(_GET_ORDER_STMT, {"order_id": order_id})
+    order = result.scalar_one_or_none()
     
     if not order:
         raise HTTPException(
@@ -193,14 +337,14 @@ def get_order(
             detail="Access denied"
         )
     
-    return OrderResponse.model_validate(order)
+    return DefaultResponse(content=OrderResponse.model_validate(order).model_dump(mode="json"))
 
 
 @router.put("/{order_id}/status", response_model=OrderResponse)
-def update_order_status(
-    order_id: str,
+async def update_order_status(
+    order_id: UUIDPath,
     status_data: OrderStatusUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> OrderResponse:
     """
@@ -209,14 +353,14 @@ def update_order_status(
     # TODO: Add role-based access control for admin/pharmacy users
     
     order_service = OrderService(db)
-    return order_service.update_order_status(order_id, status_data, current_user.id)
+    return await order_service.update_order_status(order_id, status_data, current_user.id)
 
 
 @router.put("/{order_id}/delivery", response_model=OrderResponse)
-def update_delivery_info(
-    order_id: str,
+async def update_delivery_info(
+    order_id: UUIDPath,
     delivery_data: OrderDeliveryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> OrderResponse:
     """
@@ -224,7 +368,10 @@ def update_delivery_info(
     """
     # TODO: Add role-based access control for admin/delivery partner users
     
-    order = db.query(Order).filter(Order.id == order_id).first()
+    result = await db.execute(
+        select(Order).where(Order.id == order_id).options(*ORDER_ITEMS_OPTIONS)
+    )
+    order = result.scalar_one_or_none()
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -241,22 +388,23 @@ def update_delivery_info(
     if order.status in [OrderStatus.CONFIRMED, OrderStatus.PROCESSING, OrderStatus.PACKED]:
         order.status = OrderStatus.SHIPPED
     
-    db.commit()
-    db.refresh(order)
+    await db.commit()
+    await db.refresh(order, ["updated_at"])
     
-    return OrderResponse.model_validate(order)
+    return DefaultResponse(content=OrderResponse.model_validate(order).model_dump(mode="json"))
 
 
 @router.get("/{order_id}/tracking", response_model=OrderTrackingInfo)
-def get_order_tracking(
-    order_id: str,
-    db: Session = Depends(get_db),
+async def get_order_tracking(
+    order_id: UUIDPath,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> OrderTrackingInfo:
     """
     Get order tracking information
     """
-    order = db.query(Order).filter(Order.id == order_id).first()
+    result = await db.execute(select(Order).where(Order.id == order_id))
+    order = result.scalar_one_or_none()
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -272,34 +420,13 @@ def get_order_tracking(
         )
     
     # Mock status history - in real implementation, this would come from a status_history table
+    created_at = order.created_at
     status_history = [
-        {
-            "status": "pending",
-            "timestamp": order.created_at.isoformat(),
-            "description": "Order placed successfully"
-        },
-        {
-            "status": "confirmed",
-            "timestamp": (order.created_at + timedelta(minutes=5)).isoformat(),
-            "description": "Order confirmed by pharmacy"
-        }
+        {"status": status_name, "timestamp": (created_at + offset).isoformat(), "description": description}
+        for status_name, offset, description in _HISTORY_TEMPLATE[:_STATUS_STAGE.get(order.status, 2)]
     ]
     
-    if order.status in [OrderStatus.PROCESSING, OrderStatus.PACKED, OrderStatus.SHIPPED, OrderStatus.OUT_FOR_DELIVERY, OrderStatus.DELIVERED]:
-        status_history.append({
-            "status": "processing",
-            "timestamp": (order.created_at + timedelta(minutes=15)).isoformat(),
-            "description": "Order is being prepared"
-        })
-    
-    if order.status in [OrderStatus.SHIPPED, OrderStatus.OUT_FOR_DELIVERY, OrderStatus.DELIVERED]:
-        status_history.append({
-            "status": "shipped",
-            "timestamp": (order.created_at + timedelta(minutes=30)).isoformat(),
-            "description": "Order picked up by delivery partner"
-        })
-    
-    return OrderTrackingInfo(
+    tracking = OrderTrackingInfo(
         order_id=order.id,
         order_number=order.order_number,
         status=order.status,
@@ -310,19 +437,23 @@ def get_order_tracking(
         current_location="Mumbai Warehouse" if order.status == OrderStatus.SHIPPED else None,
         delivery_address=order.delivery_address
     )
+    return DefaultResponse(content=tracking.model_dump(mode="json"))
 
 
 @router.post("/{order_id}/cancel", response_model=OrderResponse)
-def cancel_order(
-    order_id: str,
+async def cancel_order(
+    order_id: UUIDPath,
     cancellation_data: OrderCancellation,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> OrderResponse:
     """
     Cancel an order
     """
-    order = db.query(Order).filter(Order.id == order_id).first()
+    result = await db.execute(
+        select(Order).where(Order.id == order_id).options(*ORDER_ITEMS_OPTIONS)
+    )
+    order = result.scalar_one_or_none()
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -340,7 +471,7 @@ def cancel_order(
     if order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED, OrderStatus.RETURNED]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot cancel order with status: {order.status}"
+            detail=f"Cannot cancel order with status: {order.status.value}"
         )
     
     # Cancel the order
@@ -351,15 +482,15 @@ def cancel_order(
     if cancellation_data.refund_requested and order.payment_status == PaymentStatus.COMPLETED:
         order.payment_status = PaymentStatus.REFUNDED
     
-    db.commit()
-    db.refresh(order)
+    await db.commit()
+    await db.refresh(order, ["updated_at"])
     
-    return OrderResponse.model_validate(order)
+    return DefaultResponse(content=OrderResponse.model_validate(order).model_dump(mode="json"))
 
 
 @router.get("/stats/overview", response_model=OrderStats)
-def get_order_stats(
-    db: Session = Depends(get_db),
+async def get_order_stats(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> OrderStats:
     """
@@ -367,25 +498,29 @@ def get_order_stats(
     """
     # TODO: Add role-based access control for admin users
     
-    # Get counts by status
-    stats = db.query(
-        func.count(Order.id).label('total'),
-        func.sum(func.case((Order.status == OrderStatus.PENDING, 1), else_=0)).label('pending'),
-        func.sum(func.case((Order.status == OrderStatus.CONFIRMED, 1), else_=0)).label('confirmed'),
-        func.sum(func.case((Order.status == OrderStatus.PROCESSING, 1), else_=0)).label('processing'),
-        func.sum(func.case((Order.status == OrderStatus.DELIVERED, 1), else_=0)).label('delivered'),
-        func.sum(func.case((Order.status == OrderStatus.CANCELLED, 1), else_=0)).label('cancelled'),
-        func.sum(Order.total_amount).label('total_revenue'),
-        func.avg(Order.total_amount).label('avg_order_value')
-    ).first()
-    
-    return OrderStats(
-        total_orders=stats.total or 0,
-        pending_orders=stats.pending or 0,
-        confirmed_orders=stats.confirmed or 0,
-        processing_orders=stats.processing or 0,
-        delivered_orders=stats.delivered or 0,
-        cancelled_orders=stats.cancelled or 0,
-        total_revenue=float(stats.total_revenue or 0),
-        average_order_value=float(stats.avg_order_value or 0)
+    cached = await cache_get(ORDER_STATS_CACHE_KEY)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # A count and revenue per status (materialized view on PostgreSQL)
+    result = await db.execute(order_stats_query(db.bind.dialect.name))
+    rows = result.all()
+    counts = {row.status: row.count for row in rows}
+    
+    total_orders = sum(counts.values())
+    total_revenue = float(sum(row.revenue or 0 for row in rows))
+    
+    response = DefaultResponse(
+        content=OrderStats(
+            total_orders=total_orders,
+            pending_orders=counts.get(OrderStatus.PENDING, 0),
+            confirmed_orders=counts.get(OrderStatus.CONFIRMED, 0),
+            processing_orders=counts.get(OrderStatus.PROCESSING, 0),
+            delivered_orders=counts.get(OrderStatus.DELIVERED, 0),
+            cancelled_orders=counts.get(OrderStatus.CANCELLED, 0),
+            total_revenue=total_revenue,
+            average_order_value=total_revenue / total_orders if total_orders else 0.0
+        ).model_dump(mode="json")
     )
+    await cache_set(ORDER_STATS_CACHE_KEY, response.body, ORDER_STATS_CACHE_TTL)
+    return response
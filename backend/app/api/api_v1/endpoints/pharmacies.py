@@ -0,0 +1,55 @@
+"""
+Pharmacy and delivery assignment lookup endpoints
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.database.session import get_db
+from app.models.delivery import DeliveryPartner, Pharmacy
+from app.models.user import User
+from app.schemas.common import UUIDPath
+from app.schemas.pharmacy import DeliveryPartnerResponse, PharmacyResponse
+from app.api.api_v1.endpoints.auth import get_current_user
+from app.services.pharmacy_service import PharmacyService
+
+router = APIRouter()
+
+
+@router.get("/nearby", response_model=List[PharmacyResponse])
+async def get_nearby_pharmacies(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude of the delivery point"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitude of the delivery point"),
+    radius_m: float = Query(5000, gt=0, le=50000, description="Search radius in metres"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of pharmacies"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> List[Pharmacy]:
+    """
+    Get active pharmacies near a delivery point, nearest first
+    """
+    return await PharmacyService(db).find_nearby_pharmacies(lat, lng, radius_m, limit)
+
+
+@router.get("/{pharmacy_id}/delivery-partners", response_model=List[DeliveryPartnerResponse])
+async def get_nearby_delivery_partners(
+    pharmacy_id: UUIDPath,
+    radius_m: float = Query(5000, gt=0, le=50000, description="Search radius in metres"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of delivery partners"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> List[DeliveryPartner]:
+    """
+    Get available delivery partners near a pharmacy, for delivery assignment
+    """
+    # TODO: Add role-based access control for admin/pharmacy users
+    pharmacy = await db.get(Pharmacy, pharmacy_id)
+    if not pharmacy:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Pharmacy not found"
+        )
+
+    return await PharmacyService(db).find_available_delivery_partners(
+        float(pharmacy.location["lat"]), float(pharmacy.location["lng"]), radius_m, limit
+    )
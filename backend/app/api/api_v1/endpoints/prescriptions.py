@@ -2,36 +2,99 @@
 Prescription management endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status, UploadFile, File, Form, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, and_, bindparam, func, select, tuple_, type_coerce
+from typing import List, Optional, Tuple
+import asyncio
+import functools
 import math
 from datetime import date, datetime
-from app.database.session import get_db
+from app.database.session import AsyncSessionLocal, get_db
 from app.models.prescription import Prescription
 from app.models.user import User
+from app.schemas.common import UUIDPath, UUIDStr
 from app.schemas.prescription import (
     PrescriptionCreate, PrescriptionUpdate, PrescriptionResponse,
     PrescriptionVerification, PrescriptionUpload, OCRResult,
     PrescriptionSearchQuery, PrescriptionSearchResponse, PrescriptionStats,
-    PrescriptionStatus
+    PrescriptionStatus, PrescriptionStatusValue
 )
 from app.api.api_v1.endpoints.auth import get_current_user
-from app.services.file_upload import upload_file
-from app.services.ocr_service import extract_text_from_image
+from app.core.cache import cache_delete, cache_get, cache_set
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.responses import DefaultResponse
+from app.services.file_upload import stream_upload
+from app.services.ocr_worker import run_ocr
 
 router = APIRouter()
 
+# Dashboards poll the stats endpoint; cache it briefly and drop it on writes
+PRESCRIPTION_STATS_CACHE_KEY = "presc:stats:v1"
+PRESCRIPTION_STATS_CACHE_TTL = 30
+
+# List endpoints read plain column rows and build responses without
+# re-validating data that came straight from the database
+_PRESCRIPTION_RESPONSE_COLUMNS = [
+    column for column in Prescription.__table__.c
+    if column.key in PrescriptionResponse.model_fields
+]
+
+
+# Search filters in mask bit order: query parameter name and a builder for
+# its clause, which binds the value by that name at execution time
+_SEARCH_FILTERS = (
+    ("status", lambda: Prescription.status == bindparam("status")),
+    ("doctor_name", lambda: Prescription.doctor_name.ilike(bindparam("doctor_name"))),
+    ("patient_name", lambda: Prescription.patient_name.ilike(bindparam("patient_name"))),
+    ("date_from", lambda: Prescription.prescription_date >= bindparam("date_from")),
+    ("date_to", lambda: Prescription.prescription_date <= bindparam("date_to")),
+    ("verified_by", lambda: Prescription.verified_by == bindparam("verified_by")),
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _search_statements(mask: int) -> Tuple[tuple, object]:
+    """
+    Build the search filters and count statement once per filter combination
+    
+    Args:
+        mask: Bit per active entry of _SEARCH_FILTERS
+        
+    Returns:
+        Filter clauses and the count statement over them
+    """
+    filters = tuple(
+        build() for bit, (_, build) in enumerate(_SEARCH_FILTERS)
+        if mask & (1 << bit)
+    )
+    return filters, select(func.count()).select_from(Prescription).where(*filters)
+
+
+async def _count_prescriptions(count_stmt, params: dict) -> int:
+    """
+    Count prescriptions on a pooled connection of its own
+    
+    Args:
+        count_stmt: Count statement from _search_statements()
+        params: Values for the filter placeholders
+        
+    Returns:
+        Number of matching prescriptions
+    """
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(count_stmt, params)
+
 
 @router.post("/upload", response_model=PrescriptionResponse, status_code=status.HTTP_201_CREATED)
-def upload_prescription(
+async def upload_prescription(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="Prescription image file"),
     doctor_name: str = Form(..., description="Doctor's name"),
     patient_name: str = Form(..., description="Patient's name"),
     prescription_date: date = Form(..., description="Prescription date"),
     notes: Optional[str] = Form(None, description="Additional notes"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> PrescriptionResponse:
     """
@@ -46,20 +109,13 @@ def upload_prescription(
     
     # Upload file to storage (mock implementation)
     try:
-        image_url = upload_file(file, "prescriptions")
+        image_url = await stream_upload(file, "prescriptions")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload file: {str(e)}"
         )
     
-    # Extract text using OCR (mock implementation)
-    try:
-        ocr_result = extract_text_from_image(image_url)
-        ocr_text = ocr_result.get("text", "")
-    except Exception as e:
-        ocr_text = f"OCR processing failed: {str(e)}"
-    
     # Create prescription record
     prescription_data = {
         "user_id": current_user.id,
@@ -68,108 +124,151 @@ def upload_prescription(
         "prescription_date": prescription_date,
         "notes": notes,
         "image_url": image_url,
-        "ocr_text": ocr_text,
         "status": PrescriptionStatus.PENDING
     }
     
     new_prescription = Prescription(**prescription_data)
     db.add(new_prescription)
-    db.commit()
-    db.refresh(new_prescription)
+    await db.commit()
+    await cache_delete(PRESCRIPTION_STATS_CACHE_KEY)
+    await db.refresh(new_prescription)
+    
+    # Extract text using OCR after the response is sent (mock implementation)
+    background_tasks.add_task(run_ocr, new_prescription.id, image_url)
     
     return PrescriptionResponse.model_validate(new_prescription)
 
 
 @router.get("/", response_model=List[PrescriptionResponse])
-def get_user_prescriptions(
+async def get_user_prescriptions(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    status_filter: Optional[PrescriptionStatus] = Query(None, alias="status"),
-    db: Session = Depends(get_db),
+    status_filter: Optional[PrescriptionStatusValue] = Query(None, alias="status"),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> List[PrescriptionResponse]:
     """
     Get current user's prescriptions
     """
-    query = db.query(Prescription).filter(Prescription.user_id == current_user.id)
+    query = select(*_PRESCRIPTION_RESPONSE_COLUMNS).where(Prescription.user_id == current_user.id)
     
     if status_filter:
-        query = query.filter(Prescription.status == status_filter)
+        query = query.where(Prescription.status == status_filter)
     
-    prescriptions = query.order_by(Prescription.created_at.desc()).offset(skip).limit(limit).all()
+    result = await db.execute(query.order_by(Prescription.created_at.desc()).offset(skip).limit(limit))
     
-    return [PrescriptionResponse.model_validate(p) for p in prescriptions]
+    return [PrescriptionResponse.model_construct(**row) for row in result.mappings()]
 
 
 @router.get("/search", response_model=PrescriptionSearchResponse)
-def search_prescriptions(
-    status_filter: Optional[PrescriptionStatus] = Query(None, alias="status"),
+async def search_prescriptions(
+    status_filter: Optional[PrescriptionStatusValue] = Query(None, alias="status"),
     doctor_name: Optional[str] = Query(None),
     patient_name: Optional[str] = Query(None),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
-    verified_by: Optional[str] = Query(None),
+    verified_by: Optional[UUIDStr] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces page"),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> PrescriptionSearchResponse:
     """
     Search prescriptions with advanced filtering (admin/pharmacist only)
+    
+    Newest first; follow next_cursor rather than page for deep pages.
     """
     # TODO: Add role-based access control for admin/pharmacist users
     
-    # Build query
-    query = db.query(Prescription)
-    
-    # Apply filters
-    if status_filter:
-        query = query.filter(Prescription.status == status_filter)
-    
-    if doctor_name:
-        query = query.filter(Prescription.doctor_name.ilike(f"%{doctor_name}%"))
-    
-    if patient_name:
-        query = query.filter(Prescription.patient_name.ilike(f"%{patient_name}%"))
-    
-    if date_from:
-        query = query.filter(Prescription.prescription_date >= date_from)
-    
-    if date_to:
-        query = query.filter(Prescription.prescription_date <= date_to)
-    
-    if verified_by:
-        query = query.filter(Prescription.verified_by == verified_by)
-    
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * page_size
-    prescriptions = query.order_by(Prescription.created_at.desc()).offset(offset).limit(page_size).all()
+    # Bind the active filters; the statements are cached per combination
+    values = {
+        "status": status_filter,
+        "doctor_name": f"%{doctor_name}%" if doctor_name else None,
+        "patient_name": f"%{patient_name}%" if patient_name else None,
+        "date_from": date_from,
+        "date_to": date_to,
+        "verified_by": verified_by,
+    }
+    mask = 0
+    params = {}
+    for bit, (name, _) in enumerate(_SEARCH_FILTERS):
+        if values[name]:
+            mask |= 1 << bit
+            params[name] = values[name]
+    filters, count_stmt = _search_statements(mask)
+    
+    query = select(*_PRESCRIPTION_RESPONSE_COLUMNS).where(*filters)
+    
+    if cursor:
+        # Keyset pagination: seek past the last prescription of the previous page
+        created_at, last_id = decode_cursor(cursor, 2)
+        try:
+            created_at = datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        created_at_column = Prescription.created_at
+        if db.bind.dialect.name == "sqlite":
+            # SQLite keeps CURRENT_TIMESTAMP defaults as text without
+            # microseconds; compare in that same text form
+            created_at_column = type_coerce(Prescription.created_at, String)
+            created_at = str(created_at)
+        query = query.where(tuple_(created_at_column, Prescription.id) < (created_at, last_id))
+    else:
+        # Page jumps: slice the ids alone (index-only on the created_at/id
+        # index), then load full rows for that one page
+        page_ids = (
+            query.with_only_columns(Prescription.id)
+            .order_by(Prescription.created_at.desc(), Prescription.id.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+            .subquery()
+        )
+        query = select(*_PRESCRIPTION_RESPONSE_COLUMNS).join(page_ids, Prescription.id == page_ids.c.id)
+    
+    # Apply pagination (id breaks ties so the order is stable across pages);
+    # the bare count runs alongside on a second connection
+    total, result = await asyncio.gather(
+        _count_prescriptions(count_stmt, params),
+        db.execute(
+            query
+            .order_by(Prescription.created_at.desc(), Prescription.id.desc())
+            .limit(page_size),
+            params
+        ),
+    )
+    rows = result.mappings().all()
     
     # Calculate total pages
     total_pages = math.ceil(total / page_size)
     
-    return PrescriptionSearchResponse(
-        prescriptions=[PrescriptionResponse.model_validate(p) for p in prescriptions],
+    next_cursor = None
+    if len(rows) == page_size:
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    
+    return PrescriptionSearchResponse.model_construct(
+        prescriptions=[PrescriptionResponse.model_construct(**row) for row in rows],
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/{prescription_id}", response_model=PrescriptionResponse)
-def get_prescription(
-    prescription_id: str,
-    db: Session = Depends(get_db),
+async def get_prescription(
+    prescription_id: UUIDPath,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> PrescriptionResponse:
     """
     Get a specific prescription by ID
     """
-    prescription = db.query(Prescription).filter(Prescription.id == prescription_id).first()
+    prescription = await db.get(Prescription, prescription_id)
     if not prescription:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -188,10 +287,10 @@ def get_prescription(
 
 
 @router.put("/{prescription_id}/verify", response_model=PrescriptionResponse)
-def verify_prescription(
-    prescription_id: str,
+async def verify_prescription(
+    prescription_id: UUIDPath,
     verification_data: PrescriptionVerification,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> PrescriptionResponse:
     """
@@ -199,7 +298,7 @@ def verify_prescription(
     """
     # TODO: Add role-based access control for pharmacist users
     
-    prescription = db.query(Prescription).filter(Prescription.id == prescription_id).first()
+    prescription = await db.get(Prescription, prescription_id)
     if not prescription:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -214,23 +313,24 @@ def verify_prescription(
     if verification_data.prescribed_medicines:
         prescription.prescribed_medicines = verification_data.prescribed_medicines
     
-    db.commit()
-    db.refresh(prescription)
+    await db.commit()
+    await cache_delete(PRESCRIPTION_STATS_CACHE_KEY)
+    await db.refresh(prescription)
     
     return PrescriptionResponse.model_validate(prescription)
 
 
 @router.put("/{prescription_id}", response_model=PrescriptionResponse)
-def update_prescription(
-    prescription_id: str,
+async def update_prescription(
+    prescription_id: UUIDPath,
     prescription_data: PrescriptionUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> PrescriptionResponse:
     """
     Update a prescription (owner or admin only)
     """
-    prescription = db.query(Prescription).filter(Prescription.id == prescription_id).first()
+    prescription = await db.get(Prescription, prescription_id)
     if not prescription:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -250,22 +350,23 @@ def update_prescription(
     for field, value in update_data.items():
         setattr(prescription, field, value)
     
-    db.commit()
-    db.refresh(prescription)
+    await db.commit()
+    await cache_delete(PRESCRIPTION_STATS_CACHE_KEY)
+    await db.refresh(prescription)
     
     return PrescriptionResponse.model_validate(prescription)
 
 
 @router.delete("/{prescription_id}")
-def delete_prescription(
-    prescription_id: str,
-    db: Session = Depends(get_db),
+async def delete_prescription(
+    prescription_id: UUIDPath,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> dict:
     """
     Delete a prescription (owner or admin only)
     """
-    prescription = db.query(Prescription).filter(Prescription.id == prescription_id).first()
+    prescription = await db.get(Prescription, prescription_id)
     if not prescription:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -280,15 +381,16 @@ def delete_prescription(
             detail="Access denied"
         )
     
-    db.delete(prescription)
-    db.commit()
+    await db.delete(prescription)
+    await db.commit()
+    await cache_delete(PRESCRIPTION_STATS_CACHE_KEY)
     
     return {"message": "Prescription deleted successfully"}
 
 
 @router.get("/stats/overview", response_model=PrescriptionStats)
-def get_prescription_stats(
-    db: Session = Depends(get_db),
+async def get_prescription_stats(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> PrescriptionStats:
     """
@@ -296,19 +398,25 @@ def get_prescription_stats(
     """
     # TODO: Add role-based access control for admin/pharmacist users
     
-    # Get counts by status
-    stats = db.query(
-        func.count(Prescription.id).label('total'),
-        func.sum(func.case((Prescription.status == PrescriptionStatus.PENDING, 1), else_=0)).label('pending'),
-        func.sum(func.case((Prescription.status == PrescriptionStatus.VERIFIED, 1), else_=0)).label('verified'),
-        func.sum(func.case((Prescription.status == PrescriptionStatus.REJECTED, 1), else_=0)).label('rejected'),
-        func.sum(func.case((Prescription.status == PrescriptionStatus.EXPIRED, 1), else_=0)).label('expired')
-    ).first()
-    
-    return PrescriptionStats(
-        total_prescriptions=stats.total or 0,
-        pending_verification=stats.pending or 0,
-        verified_prescriptions=stats.verified or 0,
-        rejected_prescriptions=stats.rejected or 0,
-        expired_prescriptions=stats.expired or 0
+    cached = await cache_get(PRESCRIPTION_STATS_CACHE_KEY)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # Get counts by status in one grouped pass (served by ix_prescriptions_status)
+    result = await db.execute(
+        select(Prescription.status, func.count().label('count'))
+        .group_by(Prescription.status)
+    )
+    counts = {row.status: row.count for row in result}
+    
+    response = DefaultResponse(
+        content=PrescriptionStats(
+            total_prescriptions=sum(counts.values()),
+            pending_verification=counts.get(PrescriptionStatus.PENDING, 0),
+            verified_prescriptions=counts.get(PrescriptionStatus.VERIFIED, 0),
+            rejected_prescriptions=counts.get(PrescriptionStatus.REJECTED, 0),
+            expired_prescriptions=counts.get(PrescriptionStatus.EXPIRED, 0)
+        ).model_dump(mode="json")
     )
+    await cache_set(PRESCRIPTION_STATS_CACHE_KEY, response.body, PRESCRIPTION_STATS_CACHE_TTL)
+    return response
@@ -0,0 +1,98 @@
+"""
+Redis-backed response cache
+
+The cache is best effort: when Redis is unreachable every lookup is a miss and
+writes are dropped, so callers always fall back to the database.
+"""
+
+import time
+from typing import Optional
+import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import NoBackoff
+from app.core.config import settings
+
+# Seconds to stop talking to Redis after a connection error
+RETRY_AFTER_SECONDS = 30
+
+_client: Optional[redis.Redis] = None
+_disabled_until = 0.0
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Get the shared Redis client, or None while Redis is marked unavailable"""
+    global _client
+    if time.monotonic() < _disabled_until:
+        return None
+    if _client is None:
+        _client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+            db=settings.REDIS_DB,
+            socket_connect_timeout=0.25,
+            socket_timeout=0.25,
+            # Fail fast; a miss is cheaper than waiting on retries
+            retry=Retry(NoBackoff(), 0),
+        )
+    return _client
+
+
+def _mark_unavailable() -> None:
+    global _disabled_until
+    _disabled_until = time.monotonic() + RETRY_AFTER_SECONDS
+
+
+async def cache_get(key: str) -> Optional[bytes]:
+    """Get a cached value, or None on a miss or Redis error"""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(key)
+    except redis.RedisError:
+        _mark_unavailable()
+        return None
+
+
+async def cache_set(key: str, value: bytes, ttl: int) -> None:
+    """Store a value with a TTL in seconds"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(key, value, ex=ttl)
+    except redis.RedisError:
+        _mark_unavailable()
+
+
+async def cache_delete(*keys: str) -> None:
+    """Delete the given keys"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.delete(*keys)
+    except redis.RedisError:
+        _mark_unavailable()
+
+
+async def cache_delete_prefix(prefix: str) -> None:
+    """Delete every key starting with prefix"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        keys = [key async for key in client.scan_iter(match=f"{prefix}*")]
+        if keys:
+            await client.delete(*keys)
+    except redis.RedisError:
+        _mark_unavailable()
+
+
+async def close_cache() -> None:
+    """Close the Redis connection pool"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
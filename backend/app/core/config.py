@@ -2,9 +2,11 @@
 Application configuration settings
 """
 
+import os
 import secrets
-from typing import Any, Dict, List, Optional, Union
-from pydantic import AnyHttpUrl, EmailStr, HttpUrl, validator, BaseSettings
+from typing import Any, Dict, List, Optional, Tuple, Union
+from pydantic import AnyHttpUrl, EmailStr, HttpUrl, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -21,7 +23,7 @@ class Settings(BaseSettings):
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173", "http://localhost:8080"]
     ALLOWED_HOSTS: List[str] = ["localhost", "127.0.0.1", "*"]
 
-    @validator("BACKEND_CORS_ORIGINS", pre=True)
+    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> List[str]:
         if isinstance(v, str):
@@ -40,6 +42,31 @@ class Settings(BaseSettings):
             return self._database_url_override
         return self.DATABASE_URL
 
+    # Worker processes (read by main.py); each one has its own connection pool
+    WEB_CONCURRENCY: int = os.cpu_count() or 1
+
+    # Connection pool (PostgreSQL) and SQL logging. DB_MAX_CONNECTIONS is the
+    # budget for the whole app, split evenly across the workers; keep it below
+    # the server's max_connections (100 by default) minus admin/migration use.
+    # DB_POOL_SIZE/DB_MAX_OVERFLOW override the derived per-worker split
+    DB_MAX_CONNECTIONS: int = 80
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_ECHO: bool = False
+
+    @property
+    def db_pool_limits(self) -> Tuple[int, int]:
+        """
+        (pool_size, max_overflow) for one worker's request engine, so that
+        WEB_CONCURRENCY workers stay within DB_MAX_CONNECTIONS together
+        """
+        per_worker = max(self.DB_MAX_CONNECTIONS // max(self.WEB_CONCURRENCY, 1), 1)
+        pool_size = self.DB_POOL_SIZE if self.DB_POOL_SIZE is not None else max(per_worker * 3 // 4, 1)
+        max_overflow = self.DB_MAX_OVERFLOW if self.DB_MAX_OVERFLOW is not None else max(per_worker - pool_size, 0)
+        return pool_size, max_overflow
+
     POSTGRES_SERVER: str = "localhost"
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "password"
@@ -58,6 +85,10 @@ class Settings(BaseSettings):
     AWS_REGION: str = "us-east-1"
     AWS_S3_BUCKET: Optional[str] = None
     
+    # OCR (prescription text extraction runs in the background)
+    OCR_MAX_CONCURRENCY: int = 4
+    OCR_RPS: float = 5.0
+    
     # SMS Configuration
     SMS_API_KEY: Optional[str] = None
     SMS_API_SECRET: Optional[str] = None
@@ -78,9 +109,14 @@ class Settings(BaseSettings):
     # Testing
     TESTING: bool = False
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        # Keys in .env that are not settings are skipped, as before
+        extra="ignore",
+        # Read once at import and shared by every module; never reassigned
+        frozen=True,
+    )
 
 
 settings = Settings()
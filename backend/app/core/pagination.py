@@ -0,0 +1,48 @@
+"""
+Opaque cursors for keyset pagination
+"""
+
+import base64
+import json
+from typing import Any, List
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row on a page
+    
+    Args:
+        values: Sort key values (JSON-serializable, or str()-able)
+        
+    Returns:
+        str: URL-safe cursor
+    """
+    payload = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor
+    
+    Args:
+        cursor: Cursor from a previous response
+        size: Expected number of sort key values
+        
+    Returns:
+        list: Sort key values
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        values = None
+    
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    
+    return values
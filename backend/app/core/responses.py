@@ -0,0 +1,45 @@
+"""
+Response classes shared by the application
+"""
+
+import hashlib
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+
+# orjson is optional (it ships as a compiled wheel); fall back to stdlib json
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
+
+def conditional_json_response(request: Request, body: bytes, max_age: int) -> Response:
+    """
+    Return a serialized JSON body with a strong ETag and Cache-Control
+
+    Clients (and CDNs) that send a matching If-None-Match get an empty 304.
+
+    Args:
+        request: Incoming request
+        body: Serialized JSON body
+        max_age: Seconds the response may be served from a cache
+
+    Returns:
+        Response: 200 with the body, or 304 when the client's copy is current
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate=300",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -2,8 +2,14 @@
 Security utilities for authentication and authorization
 """
 
-from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Union, Optional, Tuple
 import jwt
 from jwt.exceptions import InvalidTokenError
 from passlib.context import CryptContext
@@ -15,46 +21,82 @@ pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 ALGORITHM = "HS256"
 
+# Signing key and codec are prepared once instead of on every token operation
+_SIGNING_KEY = settings.SECRET_KEY.encode()
+_ALGORITHMS = [ALGORITHM]
+_jwt = jwt.PyJWT(options={"verify_aud": False, "verify_iss": False})
+
+# Token lifetimes, computed once at import
+_ACCESS_DELTA = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+_REFRESH_DELTA = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+
+# Threads for password hashing, created on first use. pbkdf2 releases the GIL,
+# so threads hash in parallel without forking the (threaded) server process
+_password_pool: Optional[ThreadPoolExecutor] = None
+
 
 def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
     """Create JWT access token"""
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(timezone.utc) + (expires_delta or _ACCESS_DELTA)
     
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def create_refresh_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
     """Create JWT refresh token"""
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(timezone.utc) + (expires_delta or _REFRESH_DELTA)
     
     to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def verify_token(token: str) -> Optional[str]:
     """Verify JWT token and return subject"""
+    claims = verify_token_claims(token)
+    if claims is None:
+        return None
+    return claims[0]
+
+
+def verify_token_claims(token: str) -> Optional[Tuple[str, Optional[float]]]:
+    """Verify JWT token and return (subject, expiry as a UNIX timestamp or None)"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-        return user_id
+        payload = _jwt.decode(token, _SIGNING_KEY, algorithms=_ALGORITHMS)
     except InvalidTokenError:
         return None
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        return None
+    expires_at = payload.get("exp")
+    return user_id, float(expires_at) if expires_at is not None else None
+
+
+def _ab64_decode(data: str) -> bytes:
+    """Decode passlib's adapted base64 ('.' for '+', no padding)"""
+    data = data.replace(".", "+")
+    return base64.b64decode(data + "=" * (-len(data) % 4))
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    # pbkdf2_sha256 hashes ($pbkdf2-sha256$rounds$salt$checksum) are checked
+    # with hashlib directly; anything else goes through passlib
+    parts = hashed_password.split("$")
+    if len(parts) != 5 or parts[1] != "pbkdf2-sha256":
+        return pwd_context.verify(plain_password, hashed_password)
+    
+    try:
+        rounds = int(parts[2])
+        salt = _ab64_decode(parts[3])
+        checksum = _ab64_decode(parts[4])
+    except ValueError:
+        return False
+    
+    derived = hashlib.pbkdf2_hmac("sha256", plain_password.encode(), salt, rounds, len(checksum))
+    return hmac.compare_digest(derived, checksum)
 
 
 def get_password_hash(password: str) -> str:
@@ -62,13 +104,44 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def get_password_pool() -> ThreadPoolExecutor:
+    """
+    Get the thread pool used for password hashing
+
+    Every uvicorn worker has its own pool, so the CPUs are split between the
+    WEB_CONCURRENCY workers rather than each worker taking all of them.
+    """
+    global _password_pool
+    if _password_pool is None:
+        max_workers = max((os.cpu_count() or 1) // max(settings.WEB_CONCURRENCY, 1), 1)
+        _password_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+    return _password_pool
+
+
+def shutdown_password_pool() -> None:
+    """Stop the password hashing threads"""
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(wait=False, cancel_futures=True)
+        _password_pool = None
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash in the hashing thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_pool(), get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash in the hashing thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_pool(), verify_password, plain_password, hashed_password)
+
+
 def create_token_pair(user_id: str) -> dict:
     """Create access and refresh token pair"""
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    refresh_token_expires = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
-    
     return {
-        "access_token": create_access_token(user_id, expires_delta=access_token_expires),
-        "refresh_token": create_refresh_token(user_id, expires_delta=refresh_token_expires),
+        "access_token": create_access_token(user_id, _ACCESS_DELTA),
+        "refresh_token": create_refresh_token(user_id, _REFRESH_DELTA),
         "token_type": "bearer"
     }
@@ -5,17 +5,87 @@ Database base configuration
 from sqlalchemy import MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import DeclarativeBase
-import uuid
-from sqlalchemy import String
+from sqlalchemy.ext.asyncio import AsyncAttrs
+from enum import Enum
+from sqlalchemy import BigInteger, Enum as SAEnum, JSON, String, TypeDecorator, Uuid
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import mapped_column
-from typing import Annotated
+from sqlalchemy.sql.functions import FunctionElement
+from typing import Annotated, Type
 
-# Custom UUID type for PostgreSQL
-uuid_pk = Annotated[uuid.UUID, mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))]
+# Key columns: native 16-byte uuid on PostgreSQL, the 36-character text form
+# on SQLite; values are str in Python either way
+UUIDType = Uuid(as_uuid=False).with_variant(String(), "sqlite")
 
-class Base(DeclarativeBase):
+# Document columns: binary, indexable jsonb on PostgreSQL, plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class new_uuid(FunctionElement):
+    """Random (version 4) uuid generated by the database in the INSERT itself"""
+    type = UUIDType
+    inherit_cache = True
+
+
+@compiles(new_uuid)
+def _compile_new_uuid(element, compiler, **kw):
+    return "gen_random_uuid()"
+
+
+@compiles(new_uuid, "sqlite")
+def _compile_new_uuid_sqlite(element, compiler, **kw):
+    return (
+        "lower(hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' || "
+        "substr(hex(randomblob(2)), 2) || '-' || "
+        "substr('89ab', 1 + (abs(random()) % 4), 1) || substr(hex(randomblob(2)), 2) || '-' || "
+        "hex(randomblob(6)))"
+    )
+
+
+uuid_pk = Annotated[str, mapped_column(UUIDType, primary_key=True, default=new_uuid(), server_default=new_uuid())]
+
+
+def enum_type(enum_class: Type[Enum], name: str) -> SAEnum:
+    """Status column type: a native ENUM of the values on PostgreSQL, VARCHAR(50) elsewhere"""
+    return SAEnum(
+        enum_class,
+        name=name,
+        values_callable=lambda members: [member.value for member in members],
+        length=50,
+    )
+
+
+class Money(TypeDecorator):
+    """Amount in rupees as a float in Python, whole paise (BIGINT) in the database"""
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(round(value * 100))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return int(value) / 100
+
+
+class Base(AsyncAttrs, DeclarativeBase):
     """Base class for all database models"""
-    pass
+
+    # Columns shown by __repr__
+    __repr_attrs__ = ("id",)
+
+    def __repr__(self) -> str:
+        # Reads the instance dict only: an expired or unloaded attribute shows
+        # as None instead of triggering a load (which fails outside a greenlet)
+        state = self.__dict__
+        return "<%s(%s)>" % (
+            type(self).__name__,
+            ", ".join("%s=%s" % (name, state.get(name)) for name in self.__repr_attrs__),
+        )
 
 # Create metadata instance
 metadata = MetaData()
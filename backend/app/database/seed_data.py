@@ -2,6 +2,7 @@
 Seed data for the database
 """
 
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from app.database.session import SessionLocal
 from app.models.category import Category
@@ -24,20 +25,22 @@ def create_categories(db: Session):
         {"name": "Emergency Medicines", "description": "Critical and emergency medicines"},
     ]
     
-    created_categories = {}
-    for cat_data in categories_data:
-        # Check if category already exists
-        existing = db.query(Category).filter(Category.name == cat_data["name"]).first()
-        if not existing:
-            category = Category(**cat_data)
-            db.add(category)
-            db.commit()
-            db.refresh(category)
-            created_categories[cat_data["name"]] = category.id
-            print(f"Created category: {cat_data['name']}")
-        else:
-            created_categories[cat_data["name"]] = existing.id
-            print(f"Category already exists: {cat_data['name']}")
+    # One lookup for the categories that already exist
+    names = [cat_data["name"] for cat_data in categories_data]
+    created_categories = dict(
+        db.execute(select(Category.name, Category.id).where(Category.name.in_(names))).all()
+    )
+    for name in created_categories:
+        print(f"Category already exists: {name}")
+    
+    # One bulk insert for the rest
+    rows_to_insert = [cat_data for cat_data in categories_data if cat_data["name"] not in created_categories]
+    if rows_to_insert:
+        result = db.execute(insert(Category).returning(Category.name, Category.id), rows_to_insert)
+        for name, category_id in result:
+            created_categories[name] = category_id
+            print(f"Created category: {name}")
+        db.commit()
     
     return created_categories
 
@@ -153,21 +156,25 @@ def create_medicines(db: Session, categories: dict):
         }
     ]
     
+    # One lookup for the medicines that already exist
+    names = [med_data["name"] for med_data in medicines_data]
+    existing = set(db.scalars(select(Medicine.name).where(Medicine.name.in_(names))))
+    for name in existing:
+        print(f"Medicine already exists: {name}")
+    
+    # One bulk insert for the rest
+    rows_to_insert = []
     for med_data in medicines_data:
-        # Check if medicine already exists
-        existing = db.query(Medicine).filter(Medicine.name == med_data["name"]).first()
-        if not existing:
-            category_id = categories.get(med_data.pop("category"))
-            medicine = Medicine(
-                category_id=category_id,
-                **med_data
-            )
-            db.add(medicine)
-            db.commit()
-            db.refresh(medicine)
-            print(f"Created medicine: {medicine.name}")
-        else:
-            print(f"Medicine already exists: {med_data['name']}")
+        if med_data["name"] in existing:
+            continue
+        category_id = categories.get(med_data.pop("category"))
+        rows_to_insert.append({"category_id": category_id, **med_data})
+    
+    if rows_to_insert:
+        db.execute(insert(Medicine), rows_to_insert)
+        db.commit()
+        for med_data in rows_to_insert:
+            print(f"Created medicine: {med_data['name']}")
 
 
 def seed_database():
@@ -2,32 +2,47 @@
 Database session configuration
 """
 
+from typing import AsyncGenerator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
 
 # Create engine with proper configuration for different databases
 database_url = str(settings.DATABASE_URL)
 
+# Compiled SQL cache size (SQLAlchemy's default is 500 statements)
+QUERY_CACHE_SIZE = 1200
+
 # Configure engine based on database type
 if "sqlite" in database_url:
     engine = create_engine(
         database_url,
-        echo=True if not settings.TESTING else False,
+        echo=settings.DB_ECHO,
+        query_cache_size=QUERY_CACHE_SIZE,
         connect_args={"check_same_thread": False},
     )
 elif "postgresql" in database_url:
+    # Only scripts (seed data) use the sync engine; request handlers never
+    # open it, so it stays out of the per-worker connection budget
     engine = create_engine(
         database_url,
-        echo=True if not settings.TESTING else False,
+        echo=settings.DB_ECHO,
+        query_cache_size=QUERY_CACHE_SIZE,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
         pool_pre_ping=True,
-        pool_recycle=300,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        # Reuse the most recently returned connection so idle ones can time out
+        pool_use_lifo=True,
     )
 else:
     # Default configuration
     engine = create_engine(
         database_url,
-        echo=True if not settings.TESTING else False,
+        echo=settings.DB_ECHO,
+        query_cache_size=QUERY_CACHE_SIZE,
     )
 
 # Create session factory
@@ -37,10 +52,62 @@ SessionLocal = sessionmaker(
     autoflush=False,
 )
 
+# Async driver URL: asyncpg for PostgreSQL, aiosqlite for local SQLite
+if database_url.startswith("postgresql://"):
+    async_database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+elif database_url.startswith("sqlite://"):
+    async_database_url = database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+else:
+    async_database_url = database_url
+
+# Create async engine used by the request handlers
+if "postgresql" in async_database_url:
+    # Sized so that all workers together stay within DB_MAX_CONNECTIONS
+    pool_size, max_overflow = settings.db_pool_limits
+    async_engine = create_async_engine(
+        async_database_url,
+        echo=settings.DB_ECHO,
+        query_cache_size=QUERY_CACHE_SIZE,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        # Reuse the most recently returned connection so idle ones can time out
+        pool_use_lifo=True,
+        connect_args={
+            # asyncpg's own per-connection prepared statement cache
+            "statement_cache_size": 1024,
+            # SQLAlchemy's asyncpg adapter cache of prepared statements
+            "prepared_statement_cache_size": 512,
+        },
+    )
+else:
+    async_engine = create_async_engine(
+        async_database_url,
+        echo=settings.DB_ECHO,
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
+
+# Create async session factory (objects stay usable after commit)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
 
-def get_db() -> Session:
+def get_sync_db() -> Session:
     """
-    Dependency to get database session
+    Dependency to get synchronous database session
     """
     db = SessionLocal()
     try:
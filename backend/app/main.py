@@ -3,7 +3,10 @@ FastAPI Quick Commerce Medicine Delivery Application
 Main application entry point
 """
 
-from fastapi import FastAPI
+import asyncio
+import contextlib
+import json
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -11,8 +14,12 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 
 from app.core.config import settings
-from app.database.session import engine
+from app.core.cache import close_cache
+from app.core.responses import DefaultResponse
+from app.core.security import shutdown_password_pool
+from app.database.session import engine, async_engine
 from app.api.api_v1.api import api_router
+from app.services.order_stats import run_order_stats_refresher
 
 
 @asynccontextmanager
@@ -20,9 +27,20 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     print("🚀 Starting Quick Commerce Medicine Delivery API...")
+    stats_refresher = None
+    if async_engine.dialect.name == "postgresql":
+        stats_refresher = asyncio.create_task(run_order_stats_refresher(async_engine))
     yield
     # Shutdown
     print("🛑 Shutting down Quick Commerce Medicine Delivery API...")
+    if stats_refresher is not None:
+        stats_refresher.cancel()
+        # Let it leave any in-flight refresh before its connection is disposed
+        with contextlib.suppress(asyncio.CancelledError):
+            await stats_refresher
+    await async_engine.dispose()
+    shutdown_password_pool()
+    await close_cache()
 
 
 # Create FastAPI application
@@ -33,6 +51,9 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=DefaultResponse,
+    # Clients call the exact route paths; a miss is a 404, not a 307 round-trip
+    redirect_slashes=False,
     lifespan=lifespan
 )
 
@@ -40,17 +61,22 @@ app = FastAPI(
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
+        # Origins are checked with `in` on every request; a set keeps it O(1)
+        allow_origins=frozenset(str(origin) for origin in settings.BACKEND_CORS_ORIGINS),
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Let browser clients read the order history pagination cursor
+        expose_headers=["X-Next-Cursor", "ETag"],
     )
 
-# Add trusted host middleware
-app.add_middleware(
-    TrustedHostMiddleware,
-    allowed_hosts=settings.ALLOWED_HOSTS
-)
+# Add trusted host middleware (a "*" entry allows every host, so skip the
+# extra middleware layer entirely)
+if "*" not in settings.ALLOWED_HOSTS:
+    app.add_middleware(
+        TrustedHostMiddleware,
+        allowed_hosts=settings.ALLOWED_HOSTS
+    )
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -72,14 +98,18 @@ async def root():
     }
 
 
+# Health check payload is constant, so serialize it once at import
+HEALTH_RESPONSE_BODY = json.dumps({
+    "status": "healthy",
+    "service": "Quick Commerce Medicine Delivery API",
+    "version": "1.0.0"
+}, separators=(",", ":")).encode()
+
+
 @app.get("/health")
-async def health_check():
+async def health_check() -> Response:
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": "Quick Commerce Medicine Delivery API",
-        "version": "1.0.0"
-    }
+    return Response(content=HEALTH_RESPONSE_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -2,39 +2,58 @@
 Medicine model
 """
 
-from sqlalchemy import String, DateTime, func, ForeignKey, Boolean, Numeric, Integer, Date, JSON
+from sqlalchemy import String, DateTime, func, ForeignKey, Boolean, Integer, Date, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any
-from app.database.base import Base, uuid_pk
+from app.database.base import Base, JSONType, Money, UUIDType, uuid_pk
 
 
 class Medicine(Base):
     __tablename__ = "medicines"
+    __table_args__ = (
+        # Partial indexes in search order for the in_stock and prescription
+        # filters, in place of single-column indexes on the flag and stock
+        # columns; each holds only the rows its filter selects
+        Index(
+            'ix_medicines_in_stock', 'name', 'id',
+            postgresql_where=text('stock_quantity > 0'),
+            sqlite_where=text('stock_quantity > 0'),
+        ),
+        Index(
+            'ix_medicines_rx', 'name', 'id',
+            postgresql_where=text('prescription_required'),
+            sqlite_where=text('prescription_required'),
+        ),
+    )
+    __repr_attrs__ = ("id", "name", "manufacturer")
 
     id: Mapped[uuid_pk]
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     generic_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     manufacturer: Mapped[str] = mapped_column(String(255), nullable=False)
-    category_id: Mapped[Optional[str]] = mapped_column(String, ForeignKey("categories.id"), nullable=True, index=True)
-    description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    category_id: Mapped[Optional[str]] = mapped_column(UUIDType, ForeignKey("categories.id"), nullable=True, index=True)
+    # Long text/JSON columns in the "details" group are only loaded where the
+    # full medicine is returned (undefer_group); carts and orders skip them
+    description: Mapped[Optional[str]] = mapped_column(String, nullable=True, deferred=True, deferred_group="details")
     dosage_form: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     strength: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
-    price: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
-    prescription_required: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
-    stock_quantity: Mapped[int] = mapped_column(Integer, default=0, nullable=False, index=True)
+    price: Mapped[float] = mapped_column(Money, nullable=False)
+    prescription_required: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    stock_quantity: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     min_stock_level: Mapped[int] = mapped_column(Integer, default=10, nullable=False)
     expiry_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     batch_number: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
-    storage_conditions: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    side_effects: Mapped[Optional[List[str]]] = mapped_column(JSON, nullable=True)
-    contraindications: Mapped[Optional[List[str]]] = mapped_column(JSON, nullable=True)
-    active_ingredients: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    storage_conditions: Mapped[Optional[str]] = mapped_column(String, nullable=True, deferred=True, deferred_group="details")
+    side_effects: Mapped[Optional[List[str]]] = mapped_column(JSONType, nullable=True, deferred=True, deferred_group="details")
+    contraindications: Mapped[Optional[List[str]]] = mapped_column(JSONType, nullable=True, deferred=True, deferred_group="details")
+    active_ingredients: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONType, nullable=True, deferred=True, deferred_group="details")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     category: Mapped[Optional["Category"]] = relationship("Category")
 
-    def __repr__(self) -> str:
-        return f"<Medicine(id={self.id}, name={self.name}, manufacturer={self.manufacturer})>"
+    # Fetch server-generated timestamps with RETURNING on INSERT/UPDATE so a
+    # written row can be serialized without another SELECT
+    __mapper_args__ = {"eager_defaults": True}
@@ -0,0 +1,27 @@
+"""
+Batch request Pydantic schemas
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any
+
+
+class BatchRequestItem(BaseModel):
+    id: str = Field(..., min_length=1, max_length=100, description="Client-chosen ID echoed in the response")
+    method: str = Field("GET", description="HTTP method (only GET is supported)")
+    url: str = Field(..., description="API path relative to /api/v1, e.g. /cart/summary")
+    headers: Optional[Dict[str, str]] = Field(None, description="Extra headers for this sub-request")
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem] = Field(..., min_length=1, max_length=20)
+
+
+class BatchResponseItem(BaseModel):
+    id: str
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchResponseItem]
@@ -2,16 +2,17 @@
 Cart Pydantic schemas
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from decimal import Decimal
+from app.schemas.common import UUIDStr
 
 
 class CartItemBase(BaseModel):
-    medicine_id: str = Field(..., description="Medicine ID")
+    medicine_id: UUIDStr = Field(..., description="Medicine ID")
     quantity: int = Field(..., ge=1, le=100, description="Quantity of medicine")
-    prescription_id: Optional[str] = Field(None, description="Prescription ID if required")
+    prescription_id: Optional[UUIDStr] = Field(None, description="Prescription ID if required")
     notes: Optional[str] = Field(None, max_length=500, description="Special instructions")
 
 
@@ -21,7 +22,7 @@ class CartItemCreate(CartItemBase):
 
 class CartItemUpdate(BaseModel):
     quantity: Optional[int] = Field(None, ge=1, le=100, description="New quantity")
-    prescription_id: Optional[str] = Field(None, description="Prescription ID if required")
+    prescription_id: Optional[UUIDStr] = Field(None, description="Prescription ID if required")
     notes: Optional[str] = Field(None, max_length=500, description="Special instructions")
 
 
@@ -36,8 +37,7 @@ class CartItemResponse(CartItemBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CartBase(BaseModel):
@@ -58,29 +58,19 @@ class CartResponse(CartBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AddToCartRequest(BaseModel):
-    medicine_id: str = Field(..., description="Medicine ID to add")
+    medicine_id: UUIDStr = Field(..., description="Medicine ID to add")
     quantity: int = Field(1, ge=1, le=100, description="Quantity to add")
-    prescription_id: Optional[str] = Field(None, description="Prescription ID if medicine requires prescription")
+    prescription_id: Optional[UUIDStr] = Field(None, description="Prescription ID if medicine requires prescription")
     notes: Optional[str] = Field(None, max_length=500, description="Special instructions")
 
-    @validator('quantity')
-    @classmethod
-    def validate_quantity(cls, v):
-        if v <= 0:
-            raise ValueError('Quantity must be greater than 0')
-        if v > 100:
-            raise ValueError('Quantity cannot exceed 100')
-        return v
-
 
 class UpdateCartItemRequest(BaseModel):
     quantity: int = Field(..., ge=1, le=100, description="New quantity")
-    prescription_id: Optional[str] = Field(None, description="Prescription ID if required")
+    prescription_id: Optional[UUIDStr] = Field(None, description="Prescription ID if required")
     notes: Optional[str] = Field(None, max_length=500, description="Special instructions")
 
 
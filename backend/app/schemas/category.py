@@ -2,15 +2,16 @@
 Category Pydantic schemas
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
+from app.schemas.common import UUIDStr
 
 
 class CategoryBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
-    parent_category_id: Optional[str] = None
+    parent_category_id: Optional[UUIDStr] = None
 
 
 class CategoryCreate(CategoryBase):
@@ -20,7 +21,7 @@ class CategoryCreate(CategoryBase):
 class CategoryUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
-    parent_category_id: Optional[str] = None
+    parent_category_id: Optional[UUIDStr] = None
 
 
 class CategoryResponse(CategoryBase):
@@ -29,8 +30,7 @@ class CategoryResponse(CategoryBase):
     updated_at: datetime
     subcategories: Optional[List["CategoryResponse"]] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CategoryWithMedicineCount(CategoryResponse):
@@ -0,0 +1,22 @@
+"""
+Field types shared by the Pydantic schemas and endpoint parameters
+"""
+
+import uuid
+from typing import Annotated
+from fastapi import Path
+from pydantic import AfterValidator
+
+
+def _canonical_uuid(value: str) -> str:
+    """Parse a UUID and return its canonical lowercase, hyphenated form"""
+    return str(uuid.UUID(value))
+
+
+# Primary keys are UUIDs kept as strings (Uuid(as_uuid=False)). Malformed
+# IDs are rejected with a 422 here instead of failing PostgreSQL's uuid cast,
+# and the canonical form matches how SQLite stores them
+UUIDStr = Annotated[str, AfterValidator(_canonical_uuid)]
+
+# Path parameters only keep validators when the Path() marker is annotated too
+UUIDPath = Annotated[UUIDStr, Path()]
@@ -2,17 +2,18 @@
 Medicine Pydantic schemas
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 from decimal import Decimal
+from app.schemas.common import UUIDStr
 
 
 class MedicineBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     generic_name: Optional[str] = Field(None, max_length=255)
     manufacturer: str = Field(..., min_length=1, max_length=255)
-    category_id: Optional[str] = None
+    category_id: Optional[UUIDStr] = None
     description: Optional[str] = None
     dosage_form: Optional[str] = Field(None, max_length=100)
     strength: Optional[str] = Field(None, max_length=100)
@@ -27,7 +28,7 @@ class MedicineBase(BaseModel):
     contraindications: Optional[List[str]] = None
     active_ingredients: Optional[Dict[str, Any]] = None
 
-    @validator('expiry_date')
+    @field_validator('expiry_date')
     @classmethod
     def validate_expiry_date(cls, v):
         if v and v <= date.today():
@@ -43,7 +44,7 @@ class MedicineUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     generic_name: Optional[str] = Field(None, max_length=255)
     manufacturer: Optional[str] = Field(None, min_length=1, max_length=255)
-    category_id: Optional[str] = None
+    category_id: Optional[UUIDStr] = None
     description: Optional[str] = None
     dosage_form: Optional[str] = Field(None, max_length=100)
     strength: Optional[str] = Field(None, max_length=100)
@@ -58,7 +59,7 @@ class MedicineUpdate(BaseModel):
     contraindications: Optional[List[str]] = None
     active_ingredients: Optional[Dict[str, Any]] = None
 
-    @validator('expiry_date')
+    @field_validator('expiry_date')
     @classmethod
     def validate_expiry_date(cls, v):
         if v and v <= date.today():
@@ -71,13 +72,12 @@ class MedicineResponse(MedicineBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MedicineSearchQuery(BaseModel):
     q: Optional[str] = Field(None, description="Search query for medicine name or generic name")
-    category_id: Optional[str] = Field(None, description="Filter by category ID")
+    category_id: Optional[UUIDStr] = Field(None, description="Filter by category ID")
     prescription_required: Optional[bool] = Field(None, description="Filter by prescription requirement")
     min_price: Optional[float] = Field(None, ge=0, description="Minimum price filter")
     max_price: Optional[float] = Field(None, ge=0, description="Maximum price filter")
@@ -88,6 +88,7 @@ class MedicineSearchQuery(BaseModel):
     sort_order: Optional[str] = Field("asc", description="Sort order: asc, desc")
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(20, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(None, description="next_cursor from the previous page; replaces page")
 
 
 class MedicineSearchResponse(BaseModel):
@@ -96,6 +97,7 @@ class MedicineSearchResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 
 class MedicineAlternatives(BaseModel):
@@ -2,10 +2,11 @@
 Order Pydantic schemas
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime, date
 from enum import Enum
+from app.schemas.common import UUIDStr
 
 
 class OrderStatus(str, Enum):
@@ -37,6 +38,12 @@ class PaymentMethod(str, Enum):
     WALLET = "wallet"
 
 
+# Plain-string forms for query filters: pydantic-core matches a Literal
+# itself instead of calling back into the Enum class
+OrderStatusValue = Literal[tuple(member.value for member in OrderStatus)]
+PaymentStatusValue = Literal[tuple(member.value for member in PaymentStatus)]
+
+
 class DeliveryAddress(BaseModel):
     street: str = Field(..., min_length=1, max_length=255)
     city: str = Field(..., min_length=1, max_length=100)
@@ -49,10 +56,10 @@ class DeliveryAddress(BaseModel):
 
 
 class OrderItemBase(BaseModel):
-    medicine_id: str = Field(..., description="Medicine ID")
+    medicine_id: UUIDStr = Field(..., description="Medicine ID")
     quantity: int = Field(..., ge=1, le=100, description="Quantity ordered")
     unit_price: float = Field(..., gt=0, description="Price per unit at time of order")
-    prescription_id: Optional[str] = Field(None, description="Prescription ID if required")
+    prescription_id: Optional[UUIDStr] = Field(None, description="Prescription ID if required")
 
 
 class OrderItemCreate(OrderItemBase):
@@ -68,8 +75,7 @@ class OrderItemResponse(OrderItemBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrderBase(BaseModel):
@@ -80,13 +86,13 @@ class OrderBase(BaseModel):
 
 
 class OrderCreate(OrderBase):
-    items: List[OrderItemCreate] = Field(..., min_items=1, description="Order items")
+    items: List[OrderItemCreate] = Field(..., min_length=1, description="Order items")
 
 
 class OrderUpdate(BaseModel):
     status: Optional[OrderStatus] = None
     payment_status: Optional[PaymentStatus] = None
-    delivery_partner_id: Optional[str] = None
+    delivery_partner_id: Optional[UUIDStr] = None
     tracking_number: Optional[str] = None
     delivery_instructions: Optional[str] = Field(None, max_length=500)
     expected_delivery_date: Optional[date] = None
@@ -112,19 +118,19 @@ class OrderResponse(OrderBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrderSearchQuery(BaseModel):
-    status: Optional[OrderStatus] = Field(None, description="Filter by order status")
-    payment_status: Optional[PaymentStatus] = Field(None, description="Filter by payment status")
+    status: Optional[OrderStatusValue] = Field(None, description="Filter by order status")
+    payment_status: Optional[PaymentStatusValue] = Field(None, description="Filter by payment status")
     date_from: Optional[date] = Field(None, description="Filter orders from this date")
     date_to: Optional[date] = Field(None, description="Filter orders until this date")
-    delivery_partner_id: Optional[str] = Field(None, description="Filter by delivery partner")
-    pharmacy_id: Optional[str] = Field(None, description="Filter by pharmacy")
+    delivery_partner_id: Optional[UUIDStr] = Field(None, description="Filter by delivery partner")
+    pharmacy_id: Optional[UUIDStr] = Field(None, description="Filter by pharmacy")
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(20, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(None, description="next_cursor from the previous page; replaces page")
 
 
 class OrderSearchResponse(BaseModel):
@@ -133,6 +139,8 @@ class OrderSearchResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    is_estimate: bool = False
+    next_cursor: Optional[str] = None
 
 
 class OrderStatusUpdate(BaseModel):
@@ -177,7 +185,7 @@ class OrderCancellation(BaseModel):
 
 
 class OrderDeliveryUpdate(BaseModel):
-    delivery_partner_id: str = Field(..., description="Delivery partner ID")
+    delivery_partner_id: UUIDStr = Field(..., description="Delivery partner ID")
     estimated_delivery_time: int = Field(..., ge=1, le=180, description="Estimated delivery time in minutes")
     tracking_number: Optional[str] = Field(None, description="Tracking number")
     pickup_time: Optional[datetime] = Field(None, description="Pickup time from pharmacy")
@@ -0,0 +1,38 @@
+"""
+Pharmacy and delivery partner Pydantic schemas
+"""
+
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+
+class GeoPoint(BaseModel):
+    lat: float = Field(..., ge=-90, le=90, description="Latitude")
+    lng: float = Field(..., ge=-180, le=180, description="Longitude")
+
+
+class PharmacyResponse(BaseModel):
+    id: str
+    name: str
+    address: str
+    location: GeoPoint
+    phone: str
+    operating_hours: Optional[Dict[str, Any]] = None
+    is_active: bool
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DeliveryPartnerResponse(BaseModel):
+    id: str
+    name: str
+    phone: str
+    vehicle_type: Optional[str] = None
+    current_location: Optional[GeoPoint] = None
+    is_available: bool
+    rating: float
+    total_deliveries: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -2,10 +2,11 @@
 Prescription Pydantic schemas
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
+from typing import Annotated, Optional, List, Dict, Any, Literal
 from datetime import datetime, date
 from enum import Enum
+from app.schemas.common import UUIDStr
 
 
 class PrescriptionStatus(str, Enum):
@@ -16,31 +17,44 @@ class PrescriptionStatus(str, Enum):
     EXPIRED = "expired"
 
 
+# Plain-string form for query filters: pydantic-core matches a Literal
+# itself instead of calling back into the Enum class
+PrescriptionStatusValue = Literal[tuple(member.value for member in PrescriptionStatus)]
+
+# Field constraints shared by the prescription schemas
+PersonName = Annotated[str, Field(min_length=1, max_length=255)]
+DoctorLicense = Annotated[str, Field(max_length=100)]
+PatientAge = Annotated[int, Field(ge=0, le=150)]
+PatientGender = Annotated[str, Field(max_length=10)]
+Diagnosis = Annotated[str, Field(max_length=500)]
+LongText = Annotated[str, Field(max_length=1000)]
+
+
 class PrescriptionBase(BaseModel):
-    doctor_name: str = Field(..., min_length=1, max_length=255)
-    doctor_license: Optional[str] = Field(None, max_length=100)
-    patient_name: str = Field(..., min_length=1, max_length=255)
-    patient_age: Optional[int] = Field(None, ge=0, le=150)
-    patient_gender: Optional[str] = Field(None, max_length=10)
-    diagnosis: Optional[str] = Field(None, max_length=500)
+    doctor_name: PersonName
+    doctor_license: Optional[DoctorLicense] = None
+    patient_name: PersonName
+    patient_age: Optional[PatientAge] = None
+    patient_gender: Optional[PatientGender] = None
+    diagnosis: Optional[Diagnosis] = None
     prescribed_medicines: List[Dict[str, Any]] = Field(default_factory=list)
-    dosage_instructions: Optional[str] = Field(None, max_length=1000)
+    dosage_instructions: Optional[LongText] = None
     prescription_date: date = Field(...)
     valid_until: Optional[date] = None
-    notes: Optional[str] = Field(None, max_length=1000)
+    notes: Optional[LongText] = None
 
-    @validator('prescription_date')
+    @field_validator('prescription_date')
     @classmethod
     def validate_prescription_date(cls, v):
         if v > date.today():
             raise ValueError('Prescription date cannot be in the future')
         return v
 
-    @validator('valid_until')
+    @field_validator('valid_until')
     @classmethod
-    def validate_valid_until(cls, v, values):
-        if v and 'prescription_date' in values:
-            if v <= values['prescription_date']:
+    def validate_valid_until(cls, v, info: ValidationInfo):
+        if v and 'prescription_date' in info.data:
+            if v <= info.data['prescription_date']:
                 raise ValueError('Valid until date must be after prescription date')
         return v
 
@@ -50,17 +64,17 @@ class PrescriptionCreate(PrescriptionBase):
 
 
 class PrescriptionUpdate(BaseModel):
-    doctor_name: Optional[str] = Field(None, min_length=1, max_length=255)
-    doctor_license: Optional[str] = Field(None, max_length=100)
-    patient_name: Optional[str] = Field(None, min_length=1, max_length=255)
-    patient_age: Optional[int] = Field(None, ge=0, le=150)
-    patient_gender: Optional[str] = Field(None, max_length=10)
-    diagnosis: Optional[str] = Field(None, max_length=500)
+    doctor_name: Optional[PersonName] = None
+    doctor_license: Optional[DoctorLicense] = None
+    patient_name: Optional[PersonName] = None
+    patient_age: Optional[PatientAge] = None
+    patient_gender: Optional[PatientGender] = None
+    diagnosis: Optional[Diagnosis] = None
     prescribed_medicines: Optional[List[Dict[str, Any]]] = None
-    dosage_instructions: Optional[str] = Field(None, max_length=1000)
+    dosage_instructions: Optional[LongText] = None
     prescription_date: Optional[date] = None
     valid_until: Optional[date] = None
-    notes: Optional[str] = Field(None, max_length=1000)
+    notes: Optional[LongText] = None
     status: Optional[PrescriptionStatus] = None
 
 
@@ -75,23 +89,22 @@ class PrescriptionResponse(PrescriptionBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PrescriptionVerification(BaseModel):
     status: PrescriptionStatus = Field(..., description="New verification status")
-    verification_notes: Optional[str] = Field(None, max_length=1000, description="Pharmacist verification notes")
+    verification_notes: Optional[LongText] = Field(None, description="Pharmacist verification notes")
     prescribed_medicines: Optional[List[Dict[str, Any]]] = Field(None, description="Verified medicine list")
 
 
 class PrescriptionUpload(BaseModel):
-    doctor_name: str = Field(..., min_length=1, max_length=255)
-    patient_name: str = Field(..., min_length=1, max_length=255)
+    doctor_name: PersonName
+    patient_name: PersonName
     prescription_date: date = Field(...)
-    notes: Optional[str] = Field(None, max_length=1000)
+    notes: Optional[LongText] = None
 
-    @validator('prescription_date')
+    @field_validator('prescription_date')
     @classmethod
     def validate_prescription_date(cls, v):
         if v > date.today():
@@ -109,12 +122,12 @@ class OCRResult(BaseModel):
 
 
 class PrescriptionSearchQuery(BaseModel):
-    status: Optional[PrescriptionStatus] = Field(None, description="Filter by status")
+    status: Optional[PrescriptionStatusValue] = Field(None, description="Filter by status")
     doctor_name: Optional[str] = Field(None, description="Filter by doctor name")
     patient_name: Optional[str] = Field(None, description="Filter by patient name")
     date_from: Optional[date] = Field(None, description="Filter prescriptions from this date")
     date_to: Optional[date] = Field(None, description="Filter prescriptions until this date")
-    verified_by: Optional[str] = Field(None, description="Filter by verifying pharmacist")
+    verified_by: Optional[UUIDStr] = Field(None, description="Filter by verifying pharmacist")
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(20, ge=1, le=100, description="Items per page")
 
@@ -125,6 +138,7 @@ class PrescriptionSearchResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 
 class PrescriptionStats(BaseModel):
@@ -2,15 +2,28 @@
 User Pydantic schemas
 """
 
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+from typing import Annotated, Optional, List, Dict, Any
 from datetime import date, datetime
 import re
-import phonenumbers
+
+# Password rules checked in order, compiled once at import
+_PASSWORD_RULES = (
+    (re.compile(r'[A-Z]'), 'Password must contain at least one uppercase letter'),
+    (re.compile(r'[a-z]'), 'Password must contain at least one lowercase letter'),
+    (re.compile(r'\d'), 'Password must contain at least one digit'),
+    (re.compile(r'[!@#$%^&*(),.?":{}|<>]'), 'Password must contain at least one special character'),
+)
+
+# First and last name constraints shared by UserCreate and UserUpdate
+PersonName = Annotated[str, Field(min_length=2, max_length=100)]
+
+# Indian mobile number already in E.164 form; anything else goes through phonenumbers
+_INDIAN_MOBILE_E164 = re.compile(r'\+91[6-9]\d{9}')
 
 
 class EmergencyContact(BaseModel):
-    name: str = Field(..., min_length=2, max_length=100)
+    name: PersonName
     phone: str = Field(..., min_length=10, max_length=20)
     relationship: str = Field(..., min_length=2, max_length=50)
 
@@ -30,36 +43,36 @@ class UserCreate(BaseModel):
     email: EmailStr
     phone: str = Field(..., min_length=10, max_length=20)
     password: str = Field(..., min_length=8, max_length=100)
-    first_name: str = Field(..., min_length=2, max_length=100)
-    last_name: str = Field(..., min_length=2, max_length=100)
+    first_name: PersonName
+    last_name: PersonName
     date_of_birth: Optional[date] = None
     medical_conditions: Optional[List[str]] = None
     allergies: Optional[List[str]] = None
     emergency_contact: Optional[EmergencyContact] = None
     delivery_addresses: Optional[List[DeliveryAddress]] = None
 
-    @validator('password')
+    @field_validator('password')
     @classmethod
     def validate_password(cls, v):
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
-        if not re.search(r'[A-Z]', v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not re.search(r'[a-z]', v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not re.search(r'\d', v):
-            raise ValueError('Password must contain at least one digit')
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', v):
-            raise ValueError('Password must contain at least one special character')
+        for pattern, message in _PASSWORD_RULES:
+            if not pattern.search(v):
+                raise ValueError(message)
         return v
 
-    @validator('phone')
+    @field_validator('phone')
     @classmethod
     def validate_phone(cls, v):
+        # Assume Indian numbers if no country code
+        if not v.startswith('+'):
+            v = '+91' + v
+        if _INDIAN_MOBILE_E164.fullmatch(v):
+            return v
+
+        # phonenumbers loads its metadata tables on import; only pay for it here
+        import phonenumbers
         try:
-            # Parse phone number (assuming Indian numbers if no country code)
-            if not v.startswith('+'):
-                v = '+91' + v
             parsed = phonenumbers.parse(v, None)
             if not phonenumbers.is_valid_number(parsed):
                 raise ValueError('Invalid phone number')
@@ -67,7 +80,7 @@ class UserCreate(BaseModel):
         except phonenumbers.NumberParseException:
             raise ValueError('Invalid phone number format')
 
-    @validator('date_of_birth')
+    @field_validator('date_of_birth')
     @classmethod
     def validate_date_of_birth(cls, v):
         if v and v >= date.today():
@@ -81,15 +94,15 @@ class UserLogin(BaseModel):
 
 
 class UserUpdate(BaseModel):
-    first_name: Optional[str] = Field(None, min_length=2, max_length=100)
-    last_name: Optional[str] = Field(None, min_length=2, max_length=100)
+    first_name: Optional[PersonName] = None
+    last_name: Optional[PersonName] = None
     date_of_birth: Optional[date] = None
     medical_conditions: Optional[List[str]] = None
     allergies: Optional[List[str]] = None
     emergency_contact: Optional[EmergencyContact] = None
     delivery_addresses: Optional[List[DeliveryAddress]] = None
 
-    @validator('date_of_birth')
+    @field_validator('date_of_birth')
     @classmethod
     def validate_date_of_birth(cls, v):
         if v and v >= date.today():
@@ -111,8 +124,7 @@ class UserResponse(BaseModel):
     delivery_addresses: Optional[List[Dict[str, Any]]]
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PhoneVerification(BaseModel):
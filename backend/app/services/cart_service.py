@@ -2,8 +2,10 @@
 Cart service for business logic
 """
 
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Dict, Any, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Dict, Any, Iterable, Optional, Set
 from datetime import date, datetime, timedelta
 from app.models.cart import Cart, CartItem
 from app.models.medicine import Medicine
@@ -15,10 +17,16 @@ from app.schemas.cart import CartValidationResult
 class CartService:
     """Service class for cart operations"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
+        # Carts and prescriptions already loaded by this service (one per
+        # request), keyed by user ID and prescription ID
+        self._carts: Dict[str, Cart] = {}
+        self._prescriptions: Dict[str, Prescription] = {}
+        # Lower-cased medicine names per prescription ID
+        self._prescribed_names: Dict[str, Set[str]] = {}
     
-    def get_or_create_cart(self, user_id: str) -> Cart:
+    async def get_or_create_cart(self, user_id: str) -> Cart:
         """
         Get existing cart or create a new one for the user
         
@@ -28,34 +36,86 @@ class CartService:
         Returns:
             Cart: User's cart
         """
-        cart = self.db.query(Cart).filter(Cart.user_id == user_id).first()
+        cart = self._carts.get(user_id)
+        if cart is not None:
+            return cart
+        
+        result = await self.db.execute(select(Cart).where(Cart.user_id == user_id))
+        cart = result.scalar_one_or_none()
         
         if not cart:
             cart = Cart(user_id=user_id)
             self.db.add(cart)
-            self.db.commit()
-            self.db.refresh(cart)
+            await self.db.commit()
+            await self.db.refresh(cart)
         
+        self._carts[user_id] = cart
         return cart
     
-    def validate_prescription_for_item(self, cart_item: CartItem) -> bool:
+    async def get_prescriptions(self, prescription_ids: Iterable[str]) -> Dict[str, Prescription]:
+        """
+        Load prescriptions by ID in a single query, skipping ones already loaded
+        
+        Args:
+            prescription_ids: Prescription IDs to load
+            
+        Returns:
+            dict: Prescriptions keyed by ID
+        """
+        ids = {prescription_id for prescription_id in prescription_ids if prescription_id}
+        missing = ids - self._prescriptions.keys()
+        if missing:
+            result = await self.db.execute(
+                select(Prescription).where(Prescription.id.in_(missing))
+            )
+            self._prescriptions.update(
+                (prescription.id, prescription) for prescription in result.scalars()
+            )
+        
+        return {
+            prescription_id: self._prescriptions[prescription_id]
+            for prescription_id in ids
+            if prescription_id in self._prescriptions
+        }
+    
+    def get_prescribed_names(self, prescription: Prescription) -> Set[str]:
+        """
+        Lower-cased names of the medicines on a prescription, built once per prescription
+        
+        Args:
+            prescription: Prescription to read
+            
+        Returns:
+            set: Prescribed medicine names
+        """
+        names = self._prescribed_names.get(prescription.id)
+        if names is None:
+            names = {
+                med.get("name", "").lower()
+                for med in prescription.prescribed_medicines or ()
+            }
+            self._prescribed_names[prescription.id] = names
+        return names
+    
+    def validate_prescription_for_item(
+        self,
+        cart_item: CartItem,
+        medicine: Any,
+        prescriptions: Dict[str, Prescription]
+    ) -> bool:
         """
-        Validate prescription for a cart item
+        Validate prescription for a cart item (no database access)
         
         Args:
             cart_item: Cart item to validate
+            medicine: Medicine (or row) with name, generic_name and prescription_required
+            prescriptions: Prescriptions preloaded with get_prescriptions()
             
         Returns:
             bool: True if prescription is valid or not required
         """
-        # Load medicine if not already loaded
-        if not hasattr(cart_item, 'medicine') or cart_item.medicine is None:
-            cart_item.medicine = self.db.query(Medicine).filter(
-                Medicine.id == cart_item.medicine_id
-            ).first()
-        
         # If medicine doesn't require prescription, it's valid
-        if not cart_item.medicine.prescription_required:
+        if not medicine.prescription_required:
             return True
         
         # If prescription is required but not provided, it's invalid
@@ -63,9 +123,7 @@ class CartService:
             return False
         
         # Check if prescription exists and is valid
-        prescription = self.db.query(Prescription).filter(
-            Prescription.id == cart_item.prescription_id
-        ).first()
+        prescription = prescriptions.get(cart_item.prescription_id)
         
         if not prescription:
             return False
@@ -80,20 +138,17 @@ class CartService:
         
         # Check if prescription contains the medicine
         if prescription.prescribed_medicines:
-            prescribed_medicine_names = [
-                med.get("name", "").lower() 
-                for med in prescription.prescribed_medicines
-            ]
+            prescribed_medicine_names = self.get_prescribed_names(prescription)
             
-            medicine_name = cart_item.medicine.name.lower()
-            generic_name = (cart_item.medicine.generic_name or "").lower()
+            medicine_name = medicine.name.lower()
+            generic_name = (medicine.generic_name or "").lower()
             
             if medicine_name not in prescribed_medicine_names and generic_name not in prescribed_medicine_names:
                 return False
         
         return True
     
-    def validate_cart(self, user_id: str) -> CartValidationResult:
+    async def validate_cart(self, user_id: str) -> CartValidationResult:
         """
         Validate entire cart for checkout
         
@@ -103,12 +158,22 @@ class CartService:
         Returns:
             CartValidationResult: Validation result with errors and warnings
         """
-        cart = self.get_or_create_cart(user_id)
+        cart = await self.get_or_create_cart(user_id)
         
-        # Get all cart items with medicine details
-        cart_items = self.db.query(CartItem).options(
-            joinedload(CartItem.medicine)
-        ).filter(CartItem.cart_id == cart.id).all()
+        # Get all cart items with medicine details and their prescriptions
+        # in a single SELECT
+        result = await self.db.execute(
+            select(CartItem, Prescription)
+            .options(joinedload(CartItem.medicine))
+            .outerjoin(Prescription, Prescription.id == CartItem.prescription_id)
+            .where(CartItem.cart_id == cart.id)
+        )
+        rows = result.all()
+        cart_items = [item for item, _ in rows]
+        prescriptions = {
+            prescription.id: prescription for _, prescription in rows if prescription
+        }
+        self._prescriptions.update(prescriptions)
         
         errors = []
         warnings = []
@@ -148,9 +213,7 @@ class CartService:
                     errors.append(f"{medicine.name}: Prescription required")
                 else:
                     # Validate prescription
-                    prescription = self.db.query(Prescription).filter(
-                        Prescription.id == item.prescription_id
-                    ).first()
+                    prescription = prescriptions.get(item.prescription_id)
                     
                     if not prescription:
                         prescription_issues.append({
@@ -164,7 +227,7 @@ class CartService:
                         prescription_issues.append({
                             "medicine_id": medicine.id,
                             "medicine_name": medicine.name,
-                            "issue": f"Prescription status: {prescription.status}",
+                            "issue": f"Prescription status: {prescription.status.value}",
                             "severity": "error"
                         })
                         errors.append(f"{medicine.name}: Prescription not verified")
@@ -194,7 +257,7 @@ class CartService:
             prescription_issues=prescription_issues
         )
     
-    def calculate_cart_totals(self, user_id: str) -> Dict[str, float]:
+    async def calculate_cart_totals(self, user_id: str) -> Dict[str, float]:
         """
         Calculate cart totals
         
@@ -204,13 +267,9 @@ class CartService:
         Returns:
             dict: Cart totals
         """
-        cart = self.get_or_create_cart(user_id)
-        
-        cart_items = self.db.query(CartItem).options(
-            joinedload(CartItem.medicine)
-        ).filter(CartItem.cart_id == cart.id).all()
-        
-        subtotal = sum(item.quantity * item.medicine.price for item in cart_items)
+        # Subtotal is maintained on the cart row by the cart_items triggers
+        subtotal = await self.db.scalar(select(Cart.subtotal).where(Cart.user_id == user_id))
+        subtotal = float(subtotal or 0)
         tax_rate = 0.18  # 18% GST
         tax_amount = subtotal * tax_rate
         
@@ -232,7 +291,7 @@ class CartService:
             "tax_rate": tax_rate
         }
     
-    def get_cart_item_count(self, user_id: str) -> int:
+    async def get_cart_item_count(self, user_id: str) -> int:
         """
         Get total number of items in cart
         
@@ -242,10 +301,10 @@ class CartService:
         Returns:
             int: Number of items in cart
         """
-        cart = self.get_or_create_cart(user_id)
-        return self.db.query(CartItem).filter(CartItem.cart_id == cart.id).count()
+        item_count = await self.db.scalar(select(Cart.item_count).where(Cart.user_id == user_id))
+        return item_count or 0
     
-    def clear_cart(self, user_id: str) -> bool:
+    async def clear_cart(self, user_id: str) -> bool:
         """
         Clear all items from cart
         
@@ -256,15 +315,20 @@ class CartService:
             bool: True if successful
         """
         try:
-            cart = self.get_or_create_cart(user_id)
-            self.db.query(CartItem).filter(CartItem.cart_id == cart.id).delete()
-            self.db.commit()
+            await self.db.execute(
+                delete(CartItem)
+                .where(
+                    CartItem.cart_id == select(Cart.id).where(Cart.user_id == user_id).scalar_subquery()
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
             return True
         except Exception:
-            self.db.rollback()
+            await self.db.rollback()
             return False
     
-    def update_item_quantity(self, user_id: str, item_id: str, quantity: int) -> bool:
+    async def update_item_quantity(self, user_id: str, item_id: str, quantity: int) -> bool:
         """
         Update quantity of a cart item
         
@@ -277,28 +341,32 @@ class CartService:
             bool: True if successful
         """
         try:
-            cart = self.get_or_create_cart(user_id)
+            cart = await self.get_or_create_cart(user_id)
             
-            cart_item = self.db.query(CartItem).filter(
-                CartItem.id == item_id,
-                CartItem.cart_id == cart.id
-            ).first()
+            result = await self.db.execute(
+                select(CartItem).where(
+                    CartItem.id == item_id,
+                    CartItem.cart_id == cart.id
+                )
+            )
+            cart_item = result.scalar_one_or_none()
             
             if not cart_item:
                 return False
             
             # Check stock availability
-            medicine = self.db.query(Medicine).filter(
-                Medicine.id == cart_item.medicine_id
-            ).first()
+            result = await self.db.execute(
+                select(Medicine).where(Medicine.id == cart_item.medicine_id)
+            )
+            medicine = result.scalar_one_or_none()
             
             if medicine.stock_quantity < quantity:
                 return False
             
             cart_item.quantity = quantity
-            self.db.commit()
+            await self.db.commit()
             return True
             
         except Exception:
-            self.db.rollback()
+            await self.db.rollback()
             return False
@@ -7,9 +7,13 @@ import uuid
 import shutil
 from pathlib import Path
 from fastapi import UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 from app.core.config import settings
 
+# Bytes read from an upload and written to storage per step
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class FileUploadService:
     """Service for handling file uploads"""
@@ -22,7 +26,7 @@ class FileUploadService:
         self.prescriptions_dir = self.upload_dir / "prescriptions"
         self.prescriptions_dir.mkdir(exist_ok=True)
     
-    def upload_file(self, file: UploadFile, folder: str = "general") -> str:
+    async def upload_file(self, file: UploadFile, folder: str = "general") -> str:
         """
         Upload a file to local storage
         
@@ -33,32 +37,52 @@ class FileUploadService:
         Returns:
             str: The file URL/path
         """
-        try:
-            # Generate unique filename
-            file_extension = Path(file.filename).suffix if file.filename else ""
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
+        return await self.stream_upload(file, folder)
+    
+    def _write_upload(self, file: UploadFile, file_path: Path) -> None:
+        """
+        Copy an upload's spooled file to storage in UPLOAD_CHUNK_SIZE steps
+        
+        Args:
+            file: The uploaded file
+            file_path: Destination path
+        """
+        file.file.seek(0)
+        with open(file_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer, UPLOAD_CHUNK_SIZE)
+    
+    async def stream_upload(self, file: UploadFile, folder: str = "general") -> str:
+        """
+        Stream an upload to local storage chunk by chunk
+        
+        Only one chunk is held in memory at a time, and the whole copy runs in
+        a single threadpool call so the event loop stays free.
+        
+        Args:
+            file: The uploaded file
+            folder: Subfolder to store the file in
             
-            # Create folder path
-            folder_path = self.upload_dir / folder
+        Returns:
+            str: The file URL/path
+        """
+        file_extension = Path(file.filename).suffix if file.filename else ""
+        unique_filename = f"{uuid.uuid4()}{file_extension}"
+        folder_path = self.upload_dir / folder
+        file_path = folder_path / unique_filename
+        
+        try:
             folder_path.mkdir(exist_ok=True)
-            
-            # Full file path
-            file_path = folder_path / unique_filename
-            
-            # Save file
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            
-            # Return relative path as URL
-            return f"/uploads/{folder}/{unique_filename}"
-            
+            await run_in_threadpool(self._write_upload, file, file_path)
         except Exception as e:
+            file_path.unlink(missing_ok=True)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to upload file: {str(e)}"
             )
+        
+        return f"/uploads/{folder}/{unique_filename}"
     
-    def delete_file(self, file_path: str) -> bool:
+    async def delete_file(self, file_path: str) -> bool:
         """
         Delete a file from storage
         
@@ -73,10 +97,9 @@ class FileUploadService:
             clean_path = file_path.lstrip("/")
             full_path = Path(clean_path)
             
-            if full_path.exists():
-                full_path.unlink()
-                return True
-            return False
+            # Raises FileNotFoundError for a missing file
+            await run_in_threadpool(full_path.unlink)
+            return True
             
         except Exception:
             return False
@@ -113,7 +136,7 @@ class FileUploadService:
 file_service = FileUploadService()
 
 
-def upload_file(file: UploadFile, folder: str = "general") -> str:
+async def upload_file(file: UploadFile, folder: str = "general") -> str:
     """
     Upload a file using the global file service
     
@@ -124,10 +147,24 @@ def upload_file(file: UploadFile, folder: str = "general") -> str:
     Returns:
         str: The file URL/path
     """
-    return file_service.upload_file(file, folder)
+    return await file_service.upload_file(file, folder)
+
+
+async def stream_upload(file: UploadFile, folder: str = "general") -> str:
+    """
+    Stream an upload to storage using the global file service
+    
+    Args:
+        file: The uploaded file
+        folder: Subfolder to store the file in
+        
+    Returns:
+        str: The file URL/path
+    """
+    return await file_service.stream_upload(file, folder)
 
 
-def delete_file(file_path: str) -> bool:
+async def delete_file(file_path: str) -> bool:
     """
     Delete a file using the global file service
     
@@ -137,7 +174,7 @@ def delete_file(file_path: str) -> bool:
     Returns:
         bool: True if deleted successfully
     """
-    return file_service.delete_file(file_path)
+    return await file_service.delete_file(file_path)
 
 
 def get_file_info(file_path: str) -> Optional[dict]:
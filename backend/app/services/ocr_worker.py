@@ -0,0 +1,121 @@
+"""
+Background OCR for uploaded prescriptions
+
+OCR runs after the upload response has been sent. A semaphore caps how many
+images are processed at once and a token bucket caps the request rate, so a
+burst of uploads queues up instead of overwhelming the OCR backend.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
+from app.core.config import settings
+from app.database.session import AsyncSessionLocal
+from app.models.prescription import Prescription
+from app.services.ocr_service import extract_text_from_image
+
+logger = logging.getLogger(__name__)
+
+# Retry rate-limit/quota failures with exponential backoff
+MAX_ATTEMPTS = 3
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# Error texts that mean "slow down" rather than "this image is bad"
+_RETRYABLE_MARKERS = ("rate limit", "too many requests", "quota", "resource exhausted", "throttl")
+_RETRYABLE_STATUS_CODES = (429, 503)
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` acquisitions per second on average"""
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_semaphore = asyncio.Semaphore(settings.OCR_MAX_CONCURRENCY)
+_rate_limiter = RateLimiter(settings.OCR_RPS)
+
+
+def is_retryable(exc: Exception) -> bool:
+    """
+    Classify an OCR failure as transient (rate limit, quota, overload)
+    
+    Args:
+        exc: Exception raised by the OCR backend
+        
+    Returns:
+        bool: True if the call is worth retrying after a backoff
+    """
+    status_code = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    if status_code in _RETRYABLE_STATUS_CODES:
+        return True
+    
+    message = str(exc).lower()
+    return any(marker in message for marker in _RETRYABLE_MARKERS)
+
+
+async def extract_text(image_url: str) -> str:
+    """
+    Run OCR on an image within the concurrency and rate limits
+    
+    Args:
+        image_url: Path/URL of the stored image
+        
+    Returns:
+        str: Extracted text
+    """
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        await _rate_limiter.acquire()
+        try:
+            async with _semaphore:
+                result = await run_in_threadpool(extract_text_from_image, image_url)
+            return result.get("text", "")
+        except Exception as exc:
+            if attempt == MAX_ATTEMPTS or not is_retryable(exc):
+                raise
+            delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+            logger.warning("OCR rate limited (attempt %d), retrying in %.0fs: %s", attempt, delay, exc)
+            await asyncio.sleep(delay)
+
+
+async def run_ocr(prescription_id: str, image_url: str) -> None:
+    """
+    Extract a prescription's text and store it on the record
+    
+    Args:
+        prescription_id: Prescription to update
+        image_url: Path/URL of the stored image
+    """
+    try:
+        ocr_text = await extract_text(image_url)
+    except Exception as e:
+        logger.exception("OCR failed for prescription %s", prescription_id)
+        ocr_text = f"OCR processing failed: {str(e)}"
+    
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Prescription)
+            .where(Prescription.id == prescription_id)
+            .values(ocr_text=ocr_text)
+        )
+        await db.commit()
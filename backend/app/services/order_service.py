@@ -2,7 +2,9 @@
 Order service for business logic
 """
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import case, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Dict, Any, Optional
 from datetime import date, datetime, timedelta
 import uuid
@@ -16,11 +18,18 @@ from app.schemas.order import (
 )
 from fastapi import HTTPException, status
 
+# Everything an order response walks: items with their medicine and
+# prescription, each relationship batched into one IN query
+ORDER_ITEMS_OPTIONS = (
+    selectinload(Order.items).selectinload(OrderItem.medicine),
+    selectinload(Order.items).selectinload(OrderItem.prescription),
+)
+
 
 class OrderService:
     """Service class for order operations"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
     def generate_order_number(self) -> str:
@@ -35,7 +44,7 @@ class OrderService:
         random_suffix = str(uuid.uuid4().int)[:4]
         return f"ORD-{today}-{random_suffix}"
     
-    def create_order(self, user_id: str, order_data: OrderCreate) -> OrderResponse:
+    async def create_order(self, user_id: str, order_data: OrderCreate) -> OrderResponse:
         """
         Create a new order
         
@@ -51,9 +60,10 @@ class OrderService:
         validated_items = []
         
         for item_data in order_data.items:
-            medicine = self.db.query(Medicine).filter(
-                Medicine.id == item_data.medicine_id
-            ).first()
+            result = await self.db.execute(
+                select(Medicine).where(Medicine.id == item_data.medicine_id)
+            )
+            medicine = result.scalar_one_or_none()
             
             if not medicine:
                 raise HTTPException(
@@ -107,56 +117,89 @@ class OrderService:
         )
         
         self.db.add(order)
-        self.db.flush()  # Get order ID
+        await self.db.flush()  # Get order ID
+        
+        # Create all order items in one multi-row insert
+        await self.db.execute(
+            insert(OrderItem),
+            [
+                {
+                    "order_id": order.id,
+                    "medicine_id": item_info["item_data"].medicine_id,
+                    "quantity": item_info["item_data"].quantity,
+                    "unit_price": item_info["medicine"].price,
+                    "total_price": item_info["item_total"],
+                    "prescription_id": item_info["item_data"].prescription_id,
+                }
+                for item_info in validated_items
+            ]
+        )
         
-        # Create order items and update stock
+        # Update medicine stock
         for item_info in validated_items:
-            medicine = item_info["medicine"]
-            item_data = item_info["item_data"]
-            
-            order_item = OrderItem(
-                order_id=order.id,
-                medicine_id=item_data.medicine_id,
-                quantity=item_data.quantity,
-                unit_price=medicine.price,
-                total_price=item_info["item_total"],
-                prescription_id=item_data.prescription_id
-            )
-            
-            self.db.add(order_item)
-            
-            # Update medicine stock
-            medicine.stock_quantity -= item_data.quantity
+            item_info["medicine"].stock_quantity -= item_info["item_data"].quantity
         
-        self.db.commit()
-        self.db.refresh(order)
+        await self.db.commit()
         
         # Load order with items for response
-        order_with_items = self.db.query(Order).options(
-            joinedload(Order.items)
-        ).filter(Order.id == order.id).first()
+        order_with_items = await self._load_order(order.id)
         
         return OrderResponse.model_validate(order_with_items)
     
-    def create_order_from_cart(
+    async def create_order_from_cart(
         self, 
         user_id: str, 
+        cart_id: str,
         cart_items: List[CartItem], 
         order_data: CreateOrderFromCart
     ) -> OrderResponse:
         """
-        Create an order from cart items
+        Create an order from cart items, reserve stock and empty the cart
+        
+        Everything happens in one transaction with a fixed number of
+        statements, whatever the number of items.
         
         Args:
             user_id: User ID
+            cart_id: ID of the cart the items belong to
             cart_items: List of cart items
             order_data: Order creation data
             
         Returns:
             OrderResponse: Created order
         """
+        quantities = {item.medicine_id: item.quantity for item in cart_items}
+        
+        # Lock the medicine rows for stock reservation; rows another checkout
+        # holds are skipped rather than waited on. populate_existing replaces
+        # stock and prices of medicines already in the session (loaded by
+        # cart validation) with the values read under the lock
+        result = await self.db.execute(
+            select(Medicine)
+            .where(Medicine.id.in_(quantities))
+            .with_for_update(skip_locked=True)
+            .execution_options(populate_existing=True)
+        )
+        medicines = {medicine.id: medicine for medicine in result.scalars()}
+        
+        if len(medicines) != len(quantities):
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Some items are being reserved by another order, please retry"
+            )
+        
+        for medicine_id, quantity in quantities.items():
+            medicine = medicines[medicine_id]
+            if medicine.stock_quantity < quantity:
+                await self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Insufficient stock for {medicine.name}. Available: {medicine.stock_quantity}"
+                )
+        
         # Calculate totals
-        subtotal = sum(item.quantity * item.medicine.price for item in cart_items)
+        subtotal = sum(float(medicines[item.medicine_id].price) * item.quantity for item in cart_items)
         tax_amount = subtotal * 0.18  # 18% GST
         delivery_fee = 50.0 if subtotal < 500 else 0.0
         total_amount = subtotal + tax_amount + delivery_fee
@@ -178,35 +221,55 @@ class OrderService:
         )
         
         self.db.add(order)
-        self.db.flush()  # Get order ID
-        
-        # Create order items from cart items and update stock
-        for cart_item in cart_items:
-            order_item = OrderItem(
-                order_id=order.id,
-                medicine_id=cart_item.medicine_id,
-                quantity=cart_item.quantity,
-                unit_price=cart_item.medicine.price,
-                total_price=cart_item.quantity * cart_item.medicine.price,
-                prescription_id=cart_item.prescription_id
+        await self.db.flush()  # Get order ID
+        
+        # Create all order items in one bulk insert
+        await self.db.execute(
+            insert(OrderItem),
+            [
+                {
+                    "order_id": order.id,
+                    "medicine_id": item.medicine_id,
+                    "quantity": item.quantity,
+                    "unit_price": medicines[item.medicine_id].price,
+                    "total_price": float(medicines[item.medicine_id].price) * item.quantity,
+                    "prescription_id": item.prescription_id,
+                }
+                for item in cart_items
+            ]
+        )
+        
+        # Decrement stock for every medicine in one statement; the stock guard
+        # keeps it from going negative where row locks are unavailable (SQLite)
+        reserved = case(quantities, value=Medicine.id, else_=0)
+        result = await self.db.execute(
+            update(Medicine)
+            .where(Medicine.id.in_(quantities), Medicine.stock_quantity >= reserved)
+            .values(stock_quantity=Medicine.stock_quantity - reserved)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(quantities):
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Stock changed while placing the order, please retry"
             )
-            
-            self.db.add(order_item)
-            
-            # Update medicine stock
-            cart_item.medicine.stock_quantity -= cart_item.quantity
         
-        self.db.commit()
-        self.db.refresh(order)
+        # Empty the cart
+        await self.db.execute(
+            delete(CartItem)
+            .where(CartItem.cart_id == cart_id)
+            .execution_options(synchronize_session=False)
+        )
+        
+        await self.db.commit()
         
         # Load order with items for response
-        order_with_items = self.db.query(Order).options(
-            joinedload(Order.items)
-        ).filter(Order.id == order.id).first()
+        order_with_items = await self._load_order(order.id)
         
         return OrderResponse.model_validate(order_with_items)
     
-    def update_order_status(
+    async def update_order_status(
         self, 
         order_id: str, 
         status_data: OrderStatusUpdate, 
@@ -223,7 +286,8 @@ class OrderService:
         Returns:
             OrderResponse: Updated order
         """
-        order = self.db.query(Order).filter(Order.id == order_id).first()
+        result = await self.db.execute(select(Order).where(Order.id == order_id))
+        order = result.scalar_one_or_none()
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -234,7 +298,7 @@ class OrderService:
         if not self._is_valid_status_transition(order.status, status_data.status):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid status transition from {order.status} to {status_data.status}"
+                detail=f"Invalid status transition from {order.status.value} to {status_data.status.value}"
             )
         
         # Update order status
@@ -253,19 +317,31 @@ class OrderService:
         if status_data.status == OrderStatus.CONFIRMED:
             order.payment_status = PaymentStatus.PROCESSING
         
-        self.db.commit()
-        self.db.refresh(order)
+        await self.db.commit()
         
         # TODO: Add status history tracking
         # TODO: Send notifications to user
         
         # Load order with items for response
-        order_with_items = self.db.query(Order).options(
-            joinedload(Order.items)
-        ).filter(Order.id == order.id).first()
+        order_with_items = await self._load_order(order.id)
         
         return OrderResponse.model_validate(order_with_items)
     
+    async def _load_order(self, order_id: str) -> Order:
+        """
+        Load an order with its items and their medicines
+        
+        Args:
+            order_id: Order ID
+            
+        Returns:
+            Order: Order with items loaded
+        """
+        result = await self.db.execute(
+            select(Order).options(*ORDER_ITEMS_OPTIONS).where(Order.id == order_id)
+        )
+        return result.scalar_one()
+    
     def _is_valid_status_transition(self, current_status: OrderStatus, new_status: OrderStatus) -> bool:
         """
         Check if status transition is valid
@@ -292,7 +368,7 @@ class OrderService:
         
         return new_status in valid_transitions.get(current_status, [])
     
-    def get_order_by_id(self, order_id: str, user_id: Optional[str] = None) -> Optional[Order]:
+    async def get_order_by_id(self, order_id: str, user_id: Optional[str] = None) -> Optional[Order]:
         """
         Get order by ID with optional user validation
         
@@ -303,16 +379,17 @@ class OrderService:
         Returns:
             Order: Order object or None if not found
         """
-        query = self.db.query(Order).options(joinedload(Order.items)).filter(
+        stmt = select(Order).options(*ORDER_ITEMS_OPTIONS).where(
             Order.id == order_id
         )
         
         if user_id:
-            query = query.filter(Order.user_id == user_id)
+            stmt = stmt.where(Order.user_id == user_id)
         
-        return query.first()
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
     
-    def get_user_orders(
+    async def get_user_orders(
         self, 
         user_id: str, 
         status_filter: Optional[OrderStatus] = None,
@@ -331,14 +408,15 @@ class OrderService:
         Returns:
             List[Order]: List of orders
         """
-        query = self.db.query(Order).options(joinedload(Order.items)).filter(
+        stmt = select(Order).options(*ORDER_ITEMS_OPTIONS).where(
             Order.user_id == user_id
         )
         
         if status_filter:
-            query = query.filter(Order.status == status_filter)
+            stmt = stmt.where(Order.status == status_filter)
         
-        return query.order_by(Order.created_at.desc()).offset(offset).limit(limit).all()
+        result = await self.db.execute(stmt.order_by(Order.created_at.desc()).offset(offset).limit(limit))
+        return result.scalars().all()
     
     def calculate_estimated_delivery_time(self, order: Order) -> int:
         """
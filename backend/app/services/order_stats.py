@@ -0,0 +1,89 @@
+"""
+Order statistics backed by the order_stats_mv materialized view
+"""
+
+import asyncio
+import logging
+from sqlalchemy import Select, column, func, select, table, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.database.base import Money
+from app.models.order import Order
+
+logger = logging.getLogger(__name__)
+
+# How often the PostgreSQL materialized view is recomputed
+REFRESH_INTERVAL_SECONDS = 60
+
+# Advisory lock key held while refreshing, so that only one worker (or
+# instance) refreshes per interval; any constant unique to this job works
+REFRESH_LOCK_KEY = 0x6F72645F73746174  # "ord_stat"
+
+ORDER_STATS_VIEW = table(
+    "order_stats_mv",
+    column("status"),
+    column("order_count"),
+    column("revenue", Money),
+)
+
+
+def order_stats_query(dialect_name: str) -> Select:
+    """
+    Build the per-status stats query for a database dialect
+    
+    Args:
+        dialect_name: SQLAlchemy dialect name of the session's engine
+        
+    Returns:
+        Select: Rows of (status, count, revenue)
+    """
+    if dialect_name == "postgresql":
+        return select(
+            ORDER_STATS_VIEW.c.status,
+            ORDER_STATS_VIEW.c.order_count.label("count"),
+            ORDER_STATS_VIEW.c.revenue,
+        )
+    
+    # No materialized views elsewhere; aggregate the orders table directly
+    return select(
+        Order.status,
+        func.count().label("count"),
+        func.sum(Order.total_amount).label("revenue"),
+    ).group_by(Order.status)
+
+
+async def refresh_order_stats(engine: AsyncEngine) -> bool:
+    """
+    Recompute order_stats_mv without blocking readers
+    
+    Every worker runs the refresher; the transaction-scoped advisory lock
+    lets the first one through and the others skip this round.
+    
+    Args:
+        engine: Async engine connected to PostgreSQL
+        
+    Returns:
+        bool: True if this call refreshed the view
+    """
+    async with engine.begin() as conn:
+        acquired = await conn.scalar(select(func.pg_try_advisory_xact_lock(REFRESH_LOCK_KEY)))
+        if not acquired:
+            return False
+        await conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY order_stats_mv"))
+    return True
+
+
+async def run_order_stats_refresher(engine: AsyncEngine) -> None:
+    """
+    Refresh order_stats_mv every REFRESH_INTERVAL_SECONDS until cancelled
+    
+    Args:
+        engine: Async engine connected to PostgreSQL
+    """
+    while True:
+        try:
+            await refresh_order_stats(engine)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Failed to refresh order_stats_mv")
+        await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
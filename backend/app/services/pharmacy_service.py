@@ -0,0 +1,130 @@
+"""
+Pharmacy and delivery partner lookups by location
+"""
+
+import math
+from sqlalchemy import ColumnElement, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.models.delivery import DeliveryPartner, Pharmacy
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def _earth_point(table: str, column: str) -> ColumnElement:
+    """
+    ll_to_earth() over a {lat, lng} JSON column, spelled exactly like the
+    ix_*_location_earth GiST indexes so PostgreSQL can match them
+    """
+    return literal_column(
+        f"ll_to_earth(({table}.{column}->>'lat')::float8, ({table}.{column}->>'lng')::float8)"
+    )
+
+
+_PHARMACY_EARTH = _earth_point("pharmacies", "location")
+_PARTNER_EARTH = _earth_point("delivery_partners", "current_location")
+
+
+def _haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in metres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+class PharmacyService:
+    """Service class for pharmacy operations"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def find_nearby_pharmacies(
+        self,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        limit: int = 10
+    ) -> List[Pharmacy]:
+        """
+        Find active pharmacies within a radius, nearest first
+        
+        Args:
+            lat: Latitude of the delivery point
+            lng: Longitude of the delivery point
+            radius_m: Search radius in metres
+            limit: Maximum number of pharmacies
+            
+        Returns:
+            List[Pharmacy]: Pharmacies ordered by distance
+        """
+        return await self._find_nearby(
+            Pharmacy, _PHARMACY_EARTH, "location", Pharmacy.is_active, lat, lng, radius_m, limit
+        )
+    
+    async def find_available_delivery_partners(
+        self,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        limit: int = 10
+    ) -> List[DeliveryPartner]:
+        """
+        Find available delivery partners within a radius, nearest first
+        
+        Args:
+            lat: Latitude of the pickup point (usually a pharmacy)
+            lng: Longitude of the pickup point
+            radius_m: Search radius in metres
+            limit: Maximum number of delivery partners
+            
+        Returns:
+            List[DeliveryPartner]: Delivery partners ordered by distance
+        """
+        return await self._find_nearby(
+            DeliveryPartner, _PARTNER_EARTH, "current_location", DeliveryPartner.is_available,
+            lat, lng, radius_m, limit
+        )
+    
+    async def _find_nearby(
+        self,
+        model: type,
+        earth: ColumnElement,
+        location_attr: str,
+        condition: ColumnElement[bool],
+        lat: float,
+        lng: float,
+        radius_m: float,
+        limit: int
+    ) -> list:
+        """Rows of model matching condition whose location is within radius_m, nearest first"""
+        if self.db.bind.dialect.name == "postgresql":
+            # earth_box probes the GiST index; earth_distance trims the box
+            # corners and orders the survivors
+            origin = func.ll_to_earth(lat, lng)
+            distance = func.earth_distance(origin, earth)
+            result = await self.db.execute(
+                select(model)
+                .where(
+                    condition,
+                    func.earth_box(origin, radius_m).op("@>")(earth),
+                    distance <= radius_m,
+                )
+                .order_by(distance)
+                .limit(limit)
+            )
+            return list(result.scalars())
+        
+        # SQLite has no spatial index; filter the candidates in Python
+        result = await self.db.execute(select(model).where(condition))
+        nearby = []
+        for row in result.scalars():
+            location = getattr(row, location_attr) or {}
+            if location.get("lat") is None or location.get("lng") is None:
+                continue
+            distance = _haversine_m(lat, lng, float(location["lat"]), float(location["lng"]))
+            if distance <= radius_m:
+                nearby.append((distance, row))
+        nearby.sort(key=lambda item: item[0])
+        return [row for _, row in nearby[:limit]]
@@ -63,4 +63,19 @@ if __name__ == "__main__":
     else:
         print("✅ Running in FastAPI mode")
         import uvicorn
-        uvicorn.run(app, host=host, port=port, log_level="info")
+        from app.core.config import settings
+        # One worker process per CPU by default; each worker's database pool
+        # and password hashing threads are sized from the same setting so the
+        # workers share the budget. uvicorn picks uvloop and httptools when
+        # they are installed
+        workers = settings.WEB_CONCURRENCY
+        print(f"👷 Workers: {workers}")
+        uvicorn.run(
+            "app.main:app",
+            host=host,
+            port=port,
+            workers=workers,
+            loop="auto",
+            http="auto",
+            log_level="info",
+        )
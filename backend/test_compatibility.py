@@ -4,12 +4,13 @@ Test script to verify backend compatibility without running the full server
 """
 
 def test_pydantic_imports():
-    """Test Pydantic v1 imports"""
+    """Test Pydantic v2 imports"""
     try:
         import pydantic
         print(f"✅ Pydantic version: {pydantic.VERSION}")
         
-        from pydantic import BaseModel, BaseSettings, validator
+        from pydantic import BaseModel, field_validator
+        from pydantic_settings import BaseSettings
         print("✅ Pydantic imports successful!")
         
         # Test basic model
@@ -17,7 +18,7 @@ def test_pydantic_imports():
             name: str
             age: int
             
-            @validator('age')
+            @field_validator('age')
             @classmethod
             def validate_age(cls, v):
                 if v < 0: